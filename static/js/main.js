@@ -26,6 +26,51 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
+    // Dashboard bulk status actions
+    const bulkForm = document.getElementById('bulk-status-form');
+    if (bulkForm) {
+        const bulkButton = document.getElementById('bulk-actions-btn');
+        const selectAll = document.getElementById('select-all-tasks');
+        const taskCheckboxes = document.querySelectorAll('.task-select');
+        const selectedIds = () => Array.from(taskCheckboxes).filter(box => box.checked).map(box => box.value);
+        const refreshBulkButton = () => {
+            bulkButton.disabled = selectedIds().length === 0;
+        };
+
+        taskCheckboxes.forEach(box => box.addEventListener('change', refreshBulkButton));
+        if (selectAll) {
+            selectAll.addEventListener('change', function() {
+                taskCheckboxes.forEach(box => {
+                    // Only select the rows the current filter or search shows
+                    if (box.closest('.task-row').style.display !== 'none') {
+                        box.checked = this.checked;
+                    }
+                });
+                refreshBulkButton();
+            });
+        }
+
+        document.querySelectorAll('.bulk-status-action').forEach(button => {
+            button.addEventListener('click', function() {
+                const ids = selectedIds();
+                const newStatus = this.dataset.status;
+                if (!ids.length || !confirm(`Change the status of ${ids.length} tasks to "${newStatus}"?`)) {
+                    return;
+                }
+                bulkForm.querySelector('input[name="status"]').value = newStatus;
+                bulkForm.querySelectorAll('input[name="task_ids"]').forEach(input => input.remove());
+                ids.forEach(id => {
+                    const input = document.createElement('input');
+                    input.type = 'hidden';
+                    input.name = 'task_ids';
+                    input.value = id;
+                    bulkForm.appendChild(input);
+                });
+                bulkForm.submit();
+            });
+        });
+    }
+
     // Task filter functionality
     const filterButtons = document.querySelectorAll('.task-filter');
     filterButtons.forEach(button => {
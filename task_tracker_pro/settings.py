@@ -82,6 +82,20 @@ else:
 #     }
 # }
 
+# Cache shared by all workers on a host (per-user task counts, etc.)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('CACHE_LOCATION', default=os.path.join(BASE_DIR, '.cache')),
+    }
+}
+
+# Seconds to keep cached per-user task counts (invalidated early on task changes)
+TASK_COUNT_CACHE_TIMEOUT = config('TASK_COUNT_CACHE_TIMEOUT', default=300, cast=int)
+
+# Rows per page for keyset-paginated task lists (API and HTML views)
+TASK_PAGE_SIZE = config('TASK_PAGE_SIZE', default=50, cast=int)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -142,13 +156,81 @@ if not DEBUG:
 TWILIO_ACCOUNT_SID = config('TWILIO_ACCOUNT_SID')
 TWILIO_AUTH_TOKEN = config('TWILIO_AUTH_TOKEN')
 TWILIO_WHATSAPP_FROM = config('TWILIO_WHATSAPP_FROM')
+# Seconds to wait on the Twilio API before a send fails
+TWILIO_TIMEOUT_SECONDS = config('TWILIO_TIMEOUT_SECONDS', default=10, cast=float)
+# Keep-alive connections kept open to the Twilio API per process
+TWILIO_POOL_MAXSIZE = config('TWILIO_POOL_MAXSIZE', default=4, cast=int)
+# Override the Twilio API host, e.g. to point at a local stand-in during testing
+TWILIO_API_BASE_URL = config('TWILIO_API_BASE_URL', default='')
+
+# Notification outbox sender (manage.py send_notifications)
+NOTIFICATION_BATCH_SIZE = config('NOTIFICATION_BATCH_SIZE', default=50, cast=int)
+NOTIFICATION_MAX_ATTEMPTS = config('NOTIFICATION_MAX_ATTEMPTS', default=5, cast=int)
+NOTIFICATION_RETRY_BASE_SECONDS = config('NOTIFICATION_RETRY_BASE_SECONDS', default=30, cast=int)
+NOTIFICATION_RETRY_MAX_SECONDS = config('NOTIFICATION_RETRY_MAX_SECONDS', default=3600, cast=int)
+# How long a claimed batch is reserved for one worker before others may retry it
+NOTIFICATION_LEASE_SECONDS = config('NOTIFICATION_LEASE_SECONDS', default=300, cast=int)
+NOTIFICATION_POLL_SECONDS = config('NOTIFICATION_POLL_SECONDS', default=5, cast=int)
+# How long a new notification waits so later changes for the same number join one digest (0 sends at once)
+NOTIFICATION_COALESCE_SECONDS = config('NOTIFICATION_COALESCE_SECONDS', default=120, cast=int)
+# Longest WhatsApp body Twilio accepts; bigger digests are split into several messages
+NOTIFICATION_MAX_BODY_CHARS = config('NOTIFICATION_MAX_BODY_CHARS', default=1600, cast=int)
 
 # Ollama settings for GenAI task creation
 OLLAMA_BASE_URL = config('OLLAMA_BASE_URL', default='http://localhost:11434')
 OLLAMA_MODEL = config('OLLAMA_MODEL', default='mistral')
+# Generations are streamed, so the read timeout is the longest gap allowed between tokens
+OLLAMA_CONNECT_TIMEOUT = config('OLLAMA_CONNECT_TIMEOUT', default=5, cast=float)
+OLLAMA_READ_TIMEOUT = config('OLLAMA_READ_TIMEOUT', default=120, cast=float)
+OLLAMA_POOL_MAXSIZE = config('OLLAMA_POOL_MAXSIZE', default=4, cast=int)
+# Upper bound on one whole generation before falling back to rule-based extraction
+OLLAMA_TIMEOUT = config('OLLAMA_TIMEOUT', default=180, cast=float)
+# Shorter limit for the streamed preview, which holds a web worker while it runs;
+# a stalled stream can take up to about twice this before falling back
+AI_PREVIEW_TIMEOUT_SECONDS = config('AI_PREVIEW_TIMEOUT_SECONDS', default=15, cast=float)
+# Circuit breaker: open after N failures (or calls slower than SLOW_SECONDS) within WINDOW_SECONDS,
+# then probe the server again every RESET_SECONDS until it answers
+OLLAMA_BREAKER_FAILURE_THRESHOLD = config('OLLAMA_BREAKER_FAILURE_THRESHOLD', default=3, cast=int)
+OLLAMA_BREAKER_WINDOW_SECONDS = config('OLLAMA_BREAKER_WINDOW_SECONDS', default=60, cast=int)
+OLLAMA_BREAKER_RESET_SECONDS = config('OLLAMA_BREAKER_RESET_SECONDS', default=30, cast=int)
+OLLAMA_BREAKER_SLOW_SECONDS = config('OLLAMA_BREAKER_SLOW_SECONDS', default=60, cast=float)
+# Cache of AI extraction results: per-process LRU size, database entry limit and lifetime
+EXTRACTION_CACHE_MEMORY_SIZE = config('EXTRACTION_CACHE_MEMORY_SIZE', default=256, cast=int)
+EXTRACTION_CACHE_MAX_ENTRIES = config('EXTRACTION_CACHE_MAX_ENTRIES', default=5000, cast=int)
+EXTRACTION_CACHE_TTL_SECONDS = config('EXTRACTION_CACHE_TTL_SECONDS', default=86400, cast=int)
+# How often memory hits refresh an entry's last use in the table, and how often the AI job worker trims it
+EXTRACTION_CACHE_TOUCH_SECONDS = config('EXTRACTION_CACHE_TOUCH_SECONDS', default=300, cast=int)
+EXTRACTION_CACHE_EVICT_SECONDS = config('EXTRACTION_CACHE_EVICT_SECONDS', default=300, cast=int)
+
+# Rule-based batch extraction: prompts per batch and worker processes (1 = inline)
+EXTRACTION_BATCH_SIZE = config('EXTRACTION_BATCH_SIZE', default=500, cast=int)
+EXTRACTION_WORKERS = config('EXTRACTION_WORKERS', default=1, cast=int)
+# Most prompts accepted by one bulk create request, and rows per bulk INSERT
+BULK_PROMPT_LIMIT = config('BULK_PROMPT_LIMIT', default=5000, cast=int)
+BULK_INSERT_BATCH_SIZE = config('BULK_INSERT_BATCH_SIZE', default=500, cast=int)
+# Most rows accepted by one task import (POST /api/tasks/import/)
+BULK_IMPORT_MAX_ROWS = config('BULK_IMPORT_MAX_ROWS', default=100000, cast=int)
+# Most tasks changed by one bulk status update (API or dashboard bulk action)
+BULK_STATUS_MAX_TASKS = config('BULK_STATUS_MAX_TASKS', default=1000, cast=int)
+# Tasks fetched per database round trip by the streaming export (GET /api/tasks/export/)
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# AI task creation jobs (manage.py run_ai_jobs): jobs processed at once, idle poll interval,
+# and how long a running job may take before it is marked failed
+AI_JOB_CONCURRENCY = config('AI_JOB_CONCURRENCY', default=2, cast=int)
+AI_JOB_POLL_SECONDS = config('AI_JOB_POLL_SECONDS', default=2, cast=float)
+AI_JOB_TIMEOUT_SECONDS = config('AI_JOB_TIMEOUT_SECONDS', default=1800, cast=int)
 
 # Whisper settings for voice-to-text
 WHISPER_ENABLED = config('WHISPER_ENABLED', default=False, cast=bool)
+# Model size to load (tiny, base, small, medium, large); loaded once per process
+WHISPER_MODEL = config('WHISPER_MODEL', default='base')
+# Load the model when the AI job worker starts instead of on the first voice note
+WHISPER_PRELOAD = config('WHISPER_PRELOAD', default=False, cast=bool)
+# Voice note limits and the ffmpeg used to decode them
+AUDIO_MAX_UPLOAD_BYTES = config('AUDIO_MAX_UPLOAD_BYTES', default=25 * 1024 * 1024, cast=int)
+AUDIO_MAX_SECONDS = config('AUDIO_MAX_SECONDS', default=600, cast=int)
+FFMPEG_BINARY = config('FFMPEG_BINARY', default='ffmpeg')
 
 # Static files settings
 STATIC_URL = '/static/'
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from tracker.ai_jobs import claim_ai_jobs, fail_stuck_jobs, run_ai_job
+from tracker.extraction_cache import extraction_cache
+from tracker.models import AITaskJob, Task
+from tracker.ollama import get_ollama_client, reset_ollama_client
+
+
+@pytest.fixture
+def ollama_down(settings):
+    settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+    settings.OLLAMA_BASE_URL = 'http://127.0.0.1:9'
+    reset_ollama_client()
+    get_ollama_client().breaker.reset()
+    extraction_cache.clear()
+    yield
+    reset_ollama_client()
+
+
+def test_submit_queues_job_without_calling_the_model(client, create_users, create_category, ollama_down):
+    admin, user1, user2 = create_users
+    client.force_login(user1)
+    response = client.post('/api/task/ai-create/', {
+        'prompt': 'Urgent damage assessment for VIN WB02A1234.',
+        'priority': 'Low',
+        'assigned_to': [user2.id],
+    }, secure=True)
+
+    job = AITaskJob.objects.get()
+    assert response.status_code == 302
+    assert response['Location'] == f'/api/task/ai-jobs/{job.id}/'
+    assert job.status == 'queued'
+    assert Task.objects.count() == 0
+
+
+def test_job_creates_task_and_status_page_redirects(client, create_users, create_category, ollama_down):
+    admin, user1, user2 = create_users
+    job = AITaskJob.objects.create(created_by=user1, prompt='Urgent damage assessment near Indore.', priority='Low')
+    job.assigned_to.set([user2])
+    client.force_login(user1)
+    assert client.get(f'/api/task/ai-jobs/{job.id}/status/', secure=True).json()['status'] == 'queued'
+
+    [claimed] = claim_ai_jobs(5)
+    assert claim_ai_jobs(5) == []
+    run_ai_job(claimed)
+
+    job.refresh_from_db()
+    assert job.status == 'done'
+    assert job.task.priority == 'Low'
+    assert job.task.created_by == user1
+    assert list(job.task.assigned_to.all()) == [user2]
+    status = client.get(f'/api/task/ai-jobs/{job.id}/status/', secure=True).json()
+    assert status['task_url'] == f'/api/task/{job.task_id}/'
+    response = client.get(f'/api/task/ai-jobs/{job.id}/', secure=True)
+    assert response['Location'] == f'/api/task/{job.task_id}/'
+
+    client.force_login(user2)
+    assert client.get(f'/api/task/ai-jobs/{job.id}/status/', secure=True).status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_command_processes_queue(create_users, create_category, ollama_down):
+    admin, user1, user2 = create_users
+    for prompt in ('Survey one.', 'Survey two.', 'Survey three.'):
+        AITaskJob.objects.create(created_by=user1, prompt=prompt)
+
+    out = StringIO()
+    # The in-memory SQLite test database locks tables across threads, so use one worker thread
+    call_command('run_ai_jobs', '--once', '--concurrency', '1', stdout=out)
+
+    assert "Processed 3 AI task jobs (0 failed)" in out.getvalue()
+    assert sorted(Task.objects.values_list('title', flat=True)) == ['Survey one.', 'Survey three.', 'Survey two.']
+
+
+def test_voice_note_job_reads_audio_from_the_row(create_users, create_category, ollama_down, monkeypatch):
+    admin, user1, user2 = create_users
+    received = []
+
+    def fake_transcribe(audio_file):
+        received.append((audio_file.name, audio_file.read()))
+        return "Survey the car at Indore."
+
+    monkeypatch.setattr('tracker.ai_jobs.transcribe_audio', fake_transcribe)
+    # The worker may run on another machine, so it only has what is in the row
+    job = AITaskJob.objects.create(created_by=user1, audio_data=b'OggS voice', audio_name='note.ogg')
+    [claimed] = claim_ai_jobs(1)
+    run_ai_job(claimed)
+
+    job.refresh_from_db()
+    assert received == [('note.ogg', b'OggS voice')]
+    assert job.status == 'done'
+    assert job.task.title == "Survey the car at Indore."
+    assert bytes(job.audio_data) == b''
+
+
+def test_job_reaped_as_stuck_stays_failed(create_users, create_category, ollama_down, settings):
+    admin, user1, user2 = create_users
+    AITaskJob.objects.create(created_by=user1, prompt='Survey one.')
+    [claimed] = claim_ai_jobs(1)
+    settings.AI_JOB_TIMEOUT_SECONDS = 0
+    assert fail_stuck_jobs(timezone.now() + timedelta(seconds=1)) == 1
+
+    # The thread that still holds the job finishes later; it must not bring the job back
+    job = run_ai_job(claimed)
+    assert job.status == 'failed'
+    assert AITaskJob.objects.get().status == 'failed'
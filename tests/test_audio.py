@@ -0,0 +1,77 @@
+import sys
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+
+from tracker.audio import AudioDecodeError, AudioTooLarge, AudioTooLong, decode_to_pcm
+from tracker.forms import AITaskForm
+
+ONE_SECOND = 16000 * 2
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, settings):
+    """An 'ffmpeg' that copies its input (stdin or the -i path) to stdout unchanged"""
+    script = tmp_path / 'ffmpeg'
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import shutil, sys\n"
+        "source = sys.argv[sys.argv.index('-i') + 1]\n"
+        "with (sys.stdin.buffer if source == 'pipe:0' else open(source, 'rb')) as f:\n"
+        "    shutil.copyfileobj(f, sys.stdout.buffer)\n"
+    )
+    script.chmod(0o755)
+    settings.FFMPEG_BINARY = str(script)
+    return script
+
+
+def test_upload_is_streamed_through_decoder(fake_ffmpeg):
+    audio = bytes(range(256)) * 500
+    upload = SimpleUploadedFile('note.ogg', audio)
+    assert decode_to_pcm(upload, max_seconds=10) == audio
+
+
+def test_file_on_disk_is_read_by_path(fake_ffmpeg):
+    upload = TemporaryUploadedFile('note.ogg', 'audio/ogg', 0, None)
+    upload.write(b'\x01\x00' * 100)
+    upload.seek(0)
+    try:
+        assert decode_to_pcm(upload, max_seconds=10) == b'\x01\x00' * 100
+    finally:
+        upload.close()
+
+
+def test_limits_are_enforced(fake_ffmpeg):
+    with pytest.raises(AudioTooLong):
+        decode_to_pcm(SimpleUploadedFile('long.ogg', b'\x00' * ONE_SECOND * 3), max_seconds=1)
+    with pytest.raises(AudioTooLarge):
+        decode_to_pcm(SimpleUploadedFile('big.ogg', b'\x00' * 2048), max_bytes=1024)
+
+
+def test_missing_decoder_is_reported(settings):
+    settings.FFMPEG_BINARY = '/nonexistent/ffmpeg'
+    with pytest.raises(AudioDecodeError):
+        decode_to_pcm(SimpleUploadedFile('note.ogg', b'\x00' * 10))
+
+
+def test_form_rejects_oversized_audio(settings):
+    settings.AUDIO_MAX_UPLOAD_BYTES = 1024
+    form = AITaskForm({'prompt': 'x'}, {'audio_file': SimpleUploadedFile('big.ogg', b'\x00' * 2048)})
+    assert not form.is_valid()
+    assert 'audio_file' in form.errors
+
+
+def test_noisy_decoder_errors_do_not_block(tmp_path, settings):
+    # Far more error output than a pipe buffer holds, written before any audio
+    script = tmp_path / 'ffmpeg'
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "for frame in range(20000):\n"
+        "    sys.stderr.write(f'Invalid data in frame {frame}\\n')\n"
+        "sys.exit(1)\n"
+    )
+    script.chmod(0o755)
+    settings.FFMPEG_BINARY = str(script)
+    with pytest.raises(AudioDecodeError, match='frame 19999'):
+        decode_to_pcm(SimpleUploadedFile('corrupt.ogg', b'\x00' * 10))
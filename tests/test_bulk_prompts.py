@@ -0,0 +1,55 @@
+from datetime import date
+
+from tracker.extraction import extract_many, extract_task_details
+from tracker.models import Category, Task
+
+PROMPTS = [
+    "Urgent damage assessment for VIN 1HGCM82633A123456, assigned to Ramesh.",
+    "Insurance claim paperwork, low priority, in 3 days",
+    "Final inspection by next friday",
+    "Survey the car at Indore",
+]
+
+
+def test_batch_extraction_matches_single_and_keeps_order():
+    today = date(2025, 5, 7)  # a Wednesday
+    expected = [extract_task_details(prompt, today) for prompt in PROMPTS]
+
+    assert list(extract_many(iter(PROMPTS * 3), today=today, workers=1, batch_size=2)) == expected * 3
+    assert list(extract_many(PROMPTS * 3, today=today, workers=2, batch_size=3)) == expected * 3
+    assert expected[1]['due_date'] == '2025-05-10'
+    assert expected[2]['due_date'] == '2025-05-09'
+    assert expected[0]['priority'] == 'High'
+    assert expected[0]['assigned_to'] == 'Ramesh'
+
+
+def test_create_tasks_from_prompts(client, create_users, create_category):
+    admin, user1, user2 = create_users
+    client.force_login(user1)
+    response = client.post(
+        '/api/tasks/from-prompts/',
+        {'prompts': PROMPTS, 'assigned_to': [user2.id]},
+        content_type='application/json',
+        secure=True,
+    )
+
+    assert response.status_code == 201
+    assert response.json()['created'] == 4
+    tasks = Task.objects.filter(id__in=response.json()['ids'])
+    assert tasks.count() == 4
+    assert {task.priority_rank for task in tasks} == {1, 2, 3}
+    assert all(list(task.assigned_to.all()) == [user2] for task in tasks)
+    # Only the "Bug" category exists, so every suggestion falls back to it
+    create_category.refresh_from_db()
+    assert create_category.total_tasks == 4
+    assert create_category.open_tasks == 4
+
+
+def test_create_from_prompts_validates_input(client, create_users, settings):
+    admin, user1, user2 = create_users
+    client.force_login(user1)
+    response = client.post('/api/tasks/from-prompts/', {'prompts': []}, content_type='application/json', secure=True)
+    assert response.status_code == 400
+    response = client.post('/api/tasks/from-prompts/', {'prompts': ['x']}, content_type='application/json', secure=True)
+    assert response.status_code == 400
+    assert not Category.objects.exists()
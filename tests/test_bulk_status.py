@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tracker.models import OutboxMessage, Role, Task, TaskHistory
+
+
+@pytest.fixture
+def tasks(create_users, create_category):
+    admin, user1, user2 = create_users
+    user1.profile.phone_number = '+15550001'
+    user1.profile.save()
+    tasks = []
+    for i in range(6):
+        task = Task.objects.create(
+            title=f"Survey {i}", description="", category=create_category, priority='Low',
+            due_date=date.today() - timedelta(days=1), status='Submitted for Approval',
+        )
+        # user1 is assigned to the first four tasks, user2 to the rest
+        task.assigned_to.add(user1 if i < 4 else user2)
+        tasks.append(task)
+    return tasks
+
+
+def test_bulk_status_api_updates_permitted_tasks(client, create_users, create_category, tasks):
+    admin, user1, user2 = create_users
+    Task.objects.filter(id=tasks[3].id).update(status='Approved')
+    client.force_login(user1)
+    ids = [task.id for task in tasks] + [999999]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(
+            '/api/tasks/bulk-status/', {'task_ids': ids, 'status': 'Approved'},
+            content_type='application/json', secure=True,
+        )
+    assert response.status_code == 200
+    assert response.json() == {
+        'updated': [task.id for task in tasks[:3]],
+        'unchanged': [tasks[3].id],
+        'not_permitted': [tasks[4].id, tasks[5].id, 999999],
+    }
+    # The work is a fixed number of queries, not a few per task
+    assert len([q for q in queries.captured_queries if q['sql'].startswith('UPDATE "tracker_task"')]) == 1
+    assert len(queries.captured_queries) < 20
+
+    assert Task.objects.filter(status='Approved').count() == 4
+    assert TaskHistory.objects.filter(new_status='Approved', actor=user1).count() == 3
+    assert OutboxMessage.objects.filter(recipient=user1, new_status='Approved').count() == 3
+    create_category.refresh_from_db()
+    assert (create_category.open_tasks, create_category.approved_tasks, create_category.overdue_tasks) == (3, 3, 6)
+
+
+def test_bulk_status_api_validates_input(client, create_users, tasks):
+    admin, user1, user2 = create_users
+    client.force_login(admin)
+    response = client.post(
+        '/api/tasks/bulk-status/', {'task_ids': [tasks[0].id], 'status': 'Done'},
+        content_type='application/json', secure=True,
+    )
+    assert response.status_code == 400
+    assert Task.objects.get(id=tasks[0].id).status == 'Submitted for Approval'
+
+
+def test_dashboard_bulk_action(client, create_users, tasks):
+    admin, user1, user2 = create_users
+    client.force_login(admin)
+    response = client.post(
+        '/api/task/bulk-update-status/',
+        {'task_ids': [tasks[0].id, tasks[5].id], 'status': 'In Progress'},
+        secure=True,
+    )
+    assert response.status_code == 302
+    assert set(Task.objects.filter(status='In Progress').values_list('id', flat=True)) == {tasks[0].id, tasks[5].id}
+
+    response = client.post('/api/task/bulk-update-status/', {'status': 'Approved'}, secure=True)
+    assert response.status_code == 302
+    assert not Task.objects.filter(status='Approved').exists()
+
+
+def test_bulk_status_api_lets_team_leaders_and_owners_update(client, create_users, tasks):
+    admin, user1, user2 = create_users
+    Role.objects.create(user=user2, role_type='Team Leader')
+    # user2 assigned the first two tasks; tasks 4 and 5 are assigned to them
+    Task.objects.filter(id__in=[tasks[0].id, tasks[1].id]).update(assigned_by=user2)
+    client.force_login(user2)
+
+    response = client.post(
+        '/api/tasks/bulk-status/', {'task_ids': [task.id for task in tasks], 'status': 'Approved'},
+        content_type='application/json', secure=True,
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        'updated': [tasks[0].id, tasks[1].id, tasks[4].id, tasks[5].id],
+        'unchanged': [],
+        'not_permitted': [tasks[2].id, tasks[3].id],
+    }
+
+    Role.objects.create(user=user1, role_type='Owner')
+    client.force_login(user1)
+    response = client.post(
+        '/api/tasks/bulk-status/', {'task_ids': [tasks[4].id, tasks[5].id], 'status': 'In Progress'},
+        content_type='application/json', secure=True,
+    )
+    assert response.json()['updated'] == [tasks[4].id, tasks[5].id]
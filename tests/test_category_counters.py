@@ -0,0 +1,79 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+
+from tracker.models import Task, Category
+from tracker.stats import rebuild_category_counters
+
+
+def counters(category):
+    category.refresh_from_db()
+    return (category.total_tasks, category.open_tasks, category.approved_tasks, category.overdue_tasks)
+
+
+def test_counters_follow_task_lifecycle(create_category):
+    other = Category.objects.create(name="Feature")
+    yesterday = date.today() - timedelta(days=1)
+    task = Task.objects.create(
+        title="A", description="", category=create_category, priority='Low',
+        due_date=yesterday, status='Not Started',
+    )
+    Task.objects.create(
+        title="B", description="", category=create_category, priority='Low',
+        due_date=date.today(), status='Approved',
+    )
+    assert counters(create_category) == (2, 1, 1, 1)
+
+    task = Task.objects.get(pk=task.pk)
+    task.status = 'Approved'
+    task.due_date = (date.today() + timedelta(days=5)).isoformat()
+    task.save()
+    assert counters(create_category) == (2, 0, 2, 0)
+
+    task.category = other
+    task.save()
+    assert counters(create_category) == (1, 0, 1, 0)
+    assert counters(other) == (1, 0, 1, 0)
+
+    task.delete()
+    assert counters(other) == (0, 0, 0, 0)
+    assert create_category.number_of_tasks() == 1
+
+
+def test_rebuild_category_counters(create_category):
+    Task.objects.create(
+        title="A", description="", category=create_category, priority='Low',
+        due_date=date.today(), status='In Progress',
+    )
+    Category.objects.update(total_tasks=0, open_tasks=5, approved_tasks=0, overdue_tasks=3)
+
+    assert rebuild_category_counters() == 1
+    assert counters(create_category) == (1, 1, 0, 0)
+    assert rebuild_category_counters() == 0
+
+
+def test_counters_use_the_committed_row_not_a_stale_instance(create_category):
+    task = Task.objects.create(
+        title="A", description="", category=create_category, priority='Low',
+        due_date=date.today(), status='In Progress',
+    )
+    first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+    first.status = 'Approved'
+    first.save()
+    # The second copy was loaded before the first save; its delta must not be applied twice
+    second.status = 'Approved'
+    second.save()
+    assert counters(create_category) == (1, 0, 1, 0)
+
+
+def test_rebuild_command(create_category):
+    Task.objects.create(
+        title="A", description="", category=create_category, priority='Low',
+        due_date=date.today() - timedelta(days=1), status='In Progress',
+    )
+    Category.objects.update(overdue_tasks=0)
+    out = StringIO()
+    call_command('rebuild_category_counters', stdout=out)
+    assert "Updated counters for 1 categories" in out.getvalue()
+    assert counters(create_category) == (1, 1, 0, 1)
@@ -0,0 +1,92 @@
+from datetime import date
+
+import pytest
+
+from tracker.models import Task
+
+
+@pytest.fixture
+def task(create_users, create_category):
+    admin, user1, user2 = create_users
+    task = Task.objects.create(
+        title="Survey", description="Front bumper", category=create_category, priority='Low',
+        due_date=date.today(), status='Not Started', assigned_by=admin,
+    )
+    task.assigned_to.add(user1)
+    return task
+
+
+def revalidate(client, url, response):
+    return client.get(url, secure=True, HTTP_IF_NONE_MATCH=response['ETag'])
+
+
+def test_task_list_and_detail_answer_304_until_something_changes(client, create_users, task):
+    admin, user1, user2 = create_users
+    client.force_login(user1)
+
+    for url in ('/api/tasks/', f'/api/tasks/{task.id}/'):
+        response = client.get(url, secure=True)
+        assert response.status_code == 200
+        assert response['ETag'] and response['Last-Modified']
+        assert 'private' in response['Cache-Control']
+
+        not_modified = revalidate(client, url, response)
+        assert not_modified.status_code == 304
+        assert not_modified.content == b''
+
+    list_response = client.get('/api/tasks/', secure=True)
+    detail_response = client.get(f'/api/tasks/{task.id}/', secure=True)
+    Task.objects.filter(id=task.id).update(status='In Progress')
+    assert revalidate(client, '/api/tasks/', list_response).status_code == 200
+    assert revalidate(client, f'/api/tasks/{task.id}/', detail_response).status_code == 200
+
+
+def test_list_etag_follows_visibility_and_user(client, create_users, task, create_category):
+    admin, user1, user2 = create_users
+    client.force_login(user1)
+    response = client.get('/api/tasks/', secure=True)
+
+    # Unassigning removes the task from user1's list
+    task.assigned_to.remove(user1)
+    assert revalidate(client, '/api/tasks/', response).status_code == 200
+
+    client.force_login(user2)
+    assert revalidate(client, '/api/tasks/', response).status_code == 200
+
+    # Clients that only send If-Modified-Since are compared against Last-Modified
+    response = client.get('/api/tasks/', secure=True)
+    assert client.get('/api/tasks/', secure=True, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code == 304
+    old = 'Mon, 01 Jan 2001 00:00:00 GMT'
+    assert client.get('/api/tasks/', secure=True, HTTP_IF_MODIFIED_SINCE=old).status_code == 200
+
+
+def test_category_etag_changes_with_counters(client, create_users, create_category):
+    admin, user1, user2 = create_users
+    client.force_login(user1)
+    url = f'/api/categories/{create_category.id}/'
+    response = client.get(url, secure=True)
+    assert revalidate(client, url, response).status_code == 304
+    list_response = client.get('/api/categories/', secure=True)
+    assert revalidate(client, '/api/categories/', list_response).status_code == 304
+
+    Task.objects.create(
+        title="New", description="", category=create_category, priority='High',
+        due_date=date.today(), status='Not Started',
+    )
+    assert revalidate(client, url, response).status_code == 200
+    assert client.get(url, secure=True).json()['total_tasks'] == 1
+    assert revalidate(client, '/api/categories/', list_response).status_code == 200
+
+
+def test_task_detail_page_is_conditional(client, create_users, task, settings):
+    settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+    admin, user1, user2 = create_users
+    client.force_login(user1)
+    url = f'/api/task/{task.id}/'
+    response = client.get(url, secure=True)
+    assert response.status_code == 200
+    assert revalidate(client, url, response).status_code == 304
+
+    client.post(f'/api/task/{task.id}/update-status/', {'status': 'In Progress'}, secure=True)
+    # The status change both changes the task and leaves a flash message to show
+    assert revalidate(client, url, response).status_code == 200
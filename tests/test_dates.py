@@ -0,0 +1,87 @@
+import sys
+from datetime import date
+
+import pytest
+
+from tracker.dates import clear_date_parser_cache, extract_due_date, get_date_parser_stats, parse_due_date
+from tracker.extraction import extract_task_details
+
+TODAY = date(2025, 5, 7)  # a Wednesday
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('next Monday', date(2025, 5, 12)),
+    ('by next friday.', date(2025, 5, 9)),
+    ('Due: 2025-06-01', date(2025, 6, 1)),
+    ('Wednesday', date(2025, 5, 14)),
+    ('in 3 days', date(2025, 5, 10)),
+    ('in a week', date(2025, 5, 14)),
+    ('in 2 weeks', date(2025, 5, 21)),
+    ('in 1 month', date(2025, 6, 7)),
+    ('next week', date(2025, 5, 14)),
+    ('tomorrow', date(2025, 5, 8)),
+    ('end of month', date(2025, 5, 31)),
+    ('end of next month', date(2025, 6, 30)),
+    ('2025-06-01', date(2025, 6, 1)),
+    ('06/15/2025', date(2025, 6, 15)),
+    ('by June 5', date(2025, 6, 5)),
+    ('March 3', date(2026, 3, 3)),
+    ('5th of July, 2026', date(2026, 7, 5)),
+])
+def test_rules(text, expected):
+    assert parse_due_date(text, TODAY, fallback=False) == expected
+
+
+def test_unknown_text_and_invalid_dates():
+    assert parse_due_date('', TODAY) is None
+    assert parse_due_date('Survey the car at Indore', TODAY, fallback=False) is None
+    assert parse_due_date('2025-02-30', TODAY, fallback=False) is None
+
+
+@pytest.mark.parametrize('text', [
+    'foo 2025-06-01 bar',
+    'report in 2 days, accident on 5 June',
+    'Please finish by next friday.',
+])
+def test_values_must_be_a_single_expression(text):
+    assert parse_due_date(text, TODAY, fallback=False) is None
+
+
+def test_results_are_memoized_per_reference_date():
+    clear_date_parser_cache()
+    assert parse_due_date('in 3 days', TODAY) == date(2025, 5, 10)
+    assert parse_due_date('in  3 days ', TODAY) == date(2025, 5, 10)
+    assert parse_due_date('in 3 days', date(2025, 5, 8)) == date(2025, 5, 11)
+    stats = get_date_parser_stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+    assert stats['fallback_calls'] == 0
+
+
+def test_dateparser_is_only_a_fallback(monkeypatch):
+    clear_date_parser_cache()
+    monkeypatch.setitem(sys.modules, 'dateparser', None)  # any import would now fail
+    assert parse_due_date('next Monday', TODAY) == date(2025, 5, 12)
+
+    monkeypatch.undo()
+    assert parse_due_date('May 2025', TODAY) == date(2025, 5, 7)
+    assert get_date_parser_stats()['fallback_parsed'] == 1
+
+
+@pytest.mark.parametrize('prompt, expected', [
+    ('Customer called today about the dent. Please finish by next Friday.', date(2026, 10, 23)),
+    ('Accident happened on Monday. Assess damage in 5 days.', date(2026, 10, 23)),
+    ('Car was parked since 3 Sept. Survey by next Monday.', date(2026, 10, 19)),
+    ('Owner said it may 2 weeks ago the bumper cracked. Finish in 3 days.', date(2026, 10, 21)),
+    ('Reported by Ramesh on Monday. Due: end of the month.', date(2026, 10, 31)),
+])
+def test_prompt_due_date_follows_a_cue(prompt, expected):
+    today = date(2026, 10, 18)  # a Sunday
+    assert extract_due_date(prompt, today) == expected
+    assert extract_task_details(prompt, today)['due_date'] == expected.isoformat()
+
+
+def test_prompt_without_a_due_date_cue_defaults_to_a_week():
+    today = date(2026, 10, 18)
+    prompt = 'Customer called today. Accident happened on 3 Sept.'
+    assert extract_due_date(prompt, today) is None
+    assert extract_task_details(prompt, today)['due_date'] == '2026-10-25'
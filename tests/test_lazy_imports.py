@@ -0,0 +1,29 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from tracker.management.commands.benchmark_imports import importer_of, parse_importtime, subtree
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_views_do_not_load_integrations():
+    code = (
+        "import sys, django; django.setup(); import tracker.views, tracker.notifications; "
+        "print(sorted(m for m in ('twilio', 'dateparser', 'whisper', 'numpy') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |     twilio.base\n"
+        "import time:       200 |        300 |   twilio\n"
+        "import time:        50 |        350 | tracker.utils\n"
+    )
+    rows = parse_importtime(output)
+    assert rows == [('twilio.base', 100, 100, 2), ('twilio', 200, 300, 1), ('tracker.utils', 50, 350, 0)]
+    assert importer_of(rows, 1) == 'tracker.utils'
+    assert subtree(rows, 1) == rows[:2]
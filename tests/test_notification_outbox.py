@@ -0,0 +1,164 @@
+import json
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+from django.utils import timezone
+
+from tracker.bulk import bulk_update_status
+from tracker.models import Task, OutboxMessage
+from tracker.notifications import process_outbox_batch
+from tracker.utils import get_twilio_stats, reset_twilio_client
+
+
+class TwilioStandIn(BaseHTTPRequestHandler):
+    """Answers the Twilio Messages API with canned responses"""
+    protocol_version = 'HTTP/1.1'
+    responses = []
+    received = []
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        form = parse_qs(self.rfile.read(length).decode())
+        self.received.append({key: values[0] for key, values in form.items()})
+        status = self.responses.pop(0) if self.responses else 201
+        if status < 400:
+            body = {'sid': f"SM{len(self.received):032d}", 'status': 'queued'}
+        else:
+            body = {'code': 20500, 'message': 'Internal error', 'status': status}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def twilio(settings):
+    TwilioStandIn.responses = []
+    TwilioStandIn.received = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TwilioStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.TWILIO_API_BASE_URL = f"http://127.0.0.1:{server.server_port}"
+    settings.NOTIFICATION_COALESCE_SECONDS = 0
+    reset_twilio_client()
+    yield TwilioStandIn
+    reset_twilio_client()
+    server.shutdown()
+
+
+@pytest.fixture
+def assigned_task(create_users, create_category):
+    admin, user1, user2 = create_users
+    for user, phone in ((user1, '+15550001'), (user2, '+15550002')):
+        user.profile.phone_number = phone
+        user.profile.save()
+    task = Task.objects.create(
+        title="Survey", description="", category=create_category, priority='Low',
+        due_date=date.today(), status='Not Started',
+    )
+    task.assigned_to.add(user1, user2)
+    return task
+
+
+def test_status_change_writes_outbox_without_sending(client, twilio, assigned_task):
+    user = assigned_task.assigned_to.first()
+    client.force_login(user)
+    client.post(f'/api/task/{assigned_task.id}/update-status/', {'status': 'In Progress'}, secure=True)
+
+    assert OutboxMessage.objects.filter(status='pending').count() == 2
+    assert twilio.received == []
+
+
+def test_worker_sends_and_retries_with_backoff(client, twilio, assigned_task, settings):
+    settings.NOTIFICATION_RETRY_BASE_SECONDS = 60
+    client.force_login(assigned_task.assigned_to.first())
+    client.post(f'/api/task/{assigned_task.id}/update-status/', {'status': 'Approved'}, secure=True)
+
+    twilio.responses = [201, 500]
+    assert process_outbox_batch() == (2, 1)
+    assert sorted(message['To'] for message in twilio.received) == ['whatsapp:+15550001', 'whatsapp:+15550002']
+
+    retry = OutboxMessage.objects.get(status='pending')
+    assert retry.attempts == 1
+    assert retry.next_attempt_at > timezone.now() + timedelta(seconds=50)
+    assert process_outbox_batch() == (0, 0)
+
+    OutboxMessage.objects.filter(pk=retry.pk).update(next_attempt_at=timezone.now())
+    assert process_outbox_batch() == (1, 1)
+    assert OutboxMessage.objects.filter(status='sent').count() == 2
+
+
+def test_worker_gives_up_on_client_errors(twilio, assigned_task):
+    OutboxMessage.objects.create(to_number='+15550009', body='hello')
+    twilio.responses = [400]
+    assert process_outbox_batch() == (1, 0)
+    assert OutboxMessage.objects.get().status == 'failed'
+
+
+def test_twilio_client_reuses_connections(twilio, assigned_task):
+    for number in range(5):
+        OutboxMessage.objects.create(to_number=f'+1555000{number}', body='hello')
+    before = get_twilio_stats()
+    assert process_outbox_batch() == (5, 5)
+
+    stats = get_twilio_stats()
+    assert stats['sends'] - before['sends'] == 5
+    assert stats['requests'] == 5
+    assert stats['connections_opened'] == 1
+
+
+def test_changes_within_window_are_sent_as_one_digest(client, twilio, assigned_task, settings):
+    settings.NOTIFICATION_COALESCE_SECONDS = 120
+    other = Task.objects.create(
+        title="Report", description="", category=assigned_task.category, priority='Low',
+        due_date=date.today(), status='Not Started',
+    )
+    other.assigned_to.add(*assigned_task.assigned_to.all())
+    client.force_login(assigned_task.assigned_to.first())
+    for task_id, status in ((assigned_task.id, 'In Progress'), (other.id, 'In Progress'), (assigned_task.id, 'Approved')):
+        client.post(f'/api/task/{task_id}/update-status/', {'status': status}, secure=True)
+
+    assert OutboxMessage.objects.count() == 6
+    assert process_outbox_batch() == (0, 0)
+
+    # Once the oldest message for a number is due, the rest of that number's messages go with it
+    first = OutboxMessage.objects.order_by('id').first()
+    OutboxMessage.objects.filter(pk=first.pk).update(next_attempt_at=timezone.now())
+    assert process_outbox_batch() == (3, 3)
+    assert len(twilio.received) == 1
+    digest = twilio.received[0]['Body']
+    assert twilio.received[0]['To'] == f"whatsapp:{first.to_number}"
+    assert "3 updates" in digest
+    assert "'Survey': Not Started → In Progress → Approved" in digest
+    assert "'Report': Not Started → In Progress" in digest
+    assert OutboxMessage.objects.filter(status='sent').values('provider_id').distinct().count() == 1
+
+
+def test_bulk_change_is_split_into_digests_that_fit(twilio, create_users, create_category):
+    admin, user1, user2 = create_users
+    user1.profile.phone_number = '+15550001'
+    user1.profile.save()
+    tasks = []
+    for i in range(200):
+        task = Task.objects.create(
+            title=f"Survey of the damaged vehicle at the Indore yard #{i}", description="",
+            category=create_category, priority='Low', due_date=date.today(), status='Not Started',
+        )
+        task.assigned_to.add(user1)
+        tasks.append(task)
+    bulk_update_status(admin, [task.id for task in tasks], 'In Progress')
+
+    assert process_outbox_batch(batch_size=500) == (200, 200)
+    bodies = [message['Body'] for message in twilio.received]
+    assert len(bodies) > 1
+    assert all(len(body) <= 1600 for body in bodies)
+    assert sum(body.count("Not Started → In Progress") for body in bodies) == 200
+    assert not OutboxMessage.objects.exclude(status='sent').exists()
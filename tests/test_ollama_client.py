@@ -0,0 +1,226 @@
+import json
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from tracker.extraction_cache import extraction_cache
+from tracker.models import ExtractionCacheEntry
+from tracker.ollama import CircuitOpenError, JSONObjectDetector, get_ollama_client, reset_ollama_client
+from tracker.utils import generate_task_from_prompt
+
+
+class OllamaStandIn(BaseHTTPRequestHandler):
+    """Streams canned ``/api/generate`` chunks as newline-delimited JSON"""
+    protocol_version = 'HTTP/1.1'
+    chunks = []
+    requests = []
+    delay = 0  # seconds to wait before each chunk
+
+    def do_GET(self):
+        payload = b'{"models": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        self.requests.append(json.loads(self.rfile.read(length)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for chunk in self.chunks + [None]:
+                time.sleep(self.delay)
+                event = {'response': chunk or '', 'done': chunk is None}
+                line = (json.dumps(event) + '\n').encode()
+                self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama(settings, db):
+    OllamaStandIn.chunks = []
+    OllamaStandIn.requests = []
+    OllamaStandIn.delay = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OllamaStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.OLLAMA_BASE_URL = f"http://127.0.0.1:{server.server_port}"
+    reset_ollama_client()
+    get_ollama_client().breaker.reset()
+    extraction_cache.clear()
+    yield OllamaStandIn
+    reset_ollama_client()
+    server.shutdown()
+
+
+def test_detector_ignores_braces_inside_strings():
+    detector = JSONObjectDetector()
+    assert not detector.feed('  {"title": "Fix {bracket}", "note": "say \\"}\\"')
+    assert not detector.feed('", "nested": {"a": 1}')
+    assert detector.feed('} trailing tokens')
+    assert json.loads(detector.document)['nested'] == {'a': 1}
+
+
+def test_stream_stops_once_json_is_complete(ollama):
+    ollama.chunks = ['{"title": "Survey VIN', ' 123", "priority": "High"', '}', '\n\n', 'ignored']
+    events = list(get_ollama_client().stream_json("survey"))
+
+    assert [kind for kind, _ in events] == ['progress', 'progress', 'progress', 'result']
+    assert events[-1][1] == {'title': 'Survey VIN 123', 'priority': 'High'}
+    assert ollama.requests[0]['stream'] is True
+
+
+def test_generate_task_uses_streamed_json(ollama):
+    ollama.chunks = ['{"title": "Inspect car", "description": "x", "priority": "Low", ', '"category_id": 2, "due_date": "2030-01-05"}']
+    task_data = generate_task_from_prompt("inspect the car")
+
+    assert task_data['title'] == "Inspect car"
+    assert task_data['due_date'] == "2030-01-05"
+
+
+def test_generate_task_falls_back_when_ollama_is_down(settings, db):
+    settings.OLLAMA_BASE_URL = 'http://127.0.0.1:9'
+    reset_ollama_client()
+    get_ollama_client().breaker.reset()
+    try:
+        task_data = generate_task_from_prompt("Urgent damage assessment for Ramesh.")
+    finally:
+        reset_ollama_client()
+
+    assert task_data['priority'] == 'High'
+    assert task_data['category_id'] == 2
+
+
+def test_breaker_opens_after_failures_and_closes_after_probe(ollama):
+    ollama.chunks = ['{"title": "Survey"}']
+    breaker = get_ollama_client().breaker
+    breaker.failure_threshold, breaker.reset_seconds = 2, 1
+    breaker.record_failure("boom")
+    breaker.record_failure("boom")
+    assert breaker.snapshot()['state'] == 'open'
+
+    # While open, callers fall back without touching the server
+    with pytest.raises(CircuitOpenError):
+        list(get_ollama_client().stream_json("survey"))
+    assert generate_task_from_prompt("Survey the car.")['title'] == "Survey the car."
+    assert ollama.requests == []
+
+    # After the reset time the next caller starts a background probe, which closes the circuit
+    cache.set(breaker._key('opened_at'), time.time() - 5, None)
+    assert not breaker.allow_request()
+    breaker.probe_thread.join(timeout=5)
+    assert breaker.allow_request()
+    assert generate_task_from_prompt("survey")['title'] == "Survey"
+    assert breaker.snapshot()['avg_latency'] is not None
+
+
+def test_unparseable_output_trips_the_breaker(ollama):
+    # The stream ends without the object ever being closed
+    ollama.chunks = ['{"title": "Survey']
+    breaker = get_ollama_client().breaker
+    breaker.failure_threshold = 2
+    for _ in range(2):
+        assert generate_task_from_prompt("Survey the car.")['title'] == "Survey the car."
+    assert breaker.snapshot()['state'] == 'open'
+
+
+def test_preview_stream_sends_progress_and_result(client, ollama, create_users):
+    admin, user1, user2 = create_users
+    ollama.chunks = ['{"title": "Claim', ' review", "category_id": 3}']
+    client.force_login(user1)
+    response = client.get('/api/task/ai-create/stream/', {'prompt': 'review claim'}, secure=True)
+
+    assert response['Content-Type'] == 'text/event-stream'
+    body = b''.join(response.streaming_content).decode()
+    assert body.count('event: progress') == 2
+    result = body.split('event: result\ndata: ')[1].split('\n')[0]
+    assert json.loads(result)['title'] == "Claim review"
+
+
+def test_preview_stream_gives_up_after_its_own_timeout(client, ollama, create_users, settings):
+    admin, user1, user2 = create_users
+    settings.AI_PREVIEW_TIMEOUT_SECONDS = 0.3
+    ollama.chunks, ollama.delay = ['{"title": ', '"Too', ' slow"}'], 0.2
+    client.force_login(user1)
+
+    started = time.monotonic()
+    response = client.get('/api/task/ai-create/stream/', {'prompt': 'Review the claim.'}, secure=True)
+    body = b''.join(response.streaming_content).decode()
+    assert time.monotonic() - started < 1.5
+    # Falls back to the rule-based result; the slow preview does not count against the server
+    result = body.split('event: result\ndata: ')[1].split('\n')[0]
+    assert json.loads(result)['title'] == "Review the claim."
+    assert get_ollama_client().breaker.snapshot()['state'] == 'closed'
+
+
+def test_repeated_prompts_are_served_from_cache(ollama):
+    ollama.chunks = ['{"title": "Inspect car", "priority": "Low", "due_date": "2030-01-05"}']
+    first = generate_task_from_prompt("Inspect the car  at Indore")
+    first['title'] = "changed by caller"
+
+    assert generate_task_from_prompt("inspect the car at indore ")['title'] == "Inspect car"
+    extraction_cache.clear()
+    assert generate_task_from_prompt("Inspect the car at Indore")['title'] == "Inspect car"
+
+    assert len(ollama.requests) == 1
+    entry = ExtractionCacheEntry.objects.get()
+    assert entry.hits == 1
+    assert entry.prompt == "inspect the car at indore"
+
+
+def test_cache_evicts_expired_and_least_recently_used(db, settings):
+    settings.EXTRACTION_CACHE_MAX_ENTRIES = 2
+    today = date.today()
+    for prompt in ("one", "two", "three"):
+        extraction_cache.set(prompt, 'mistral', today, {'title': prompt})
+    # Writes never trim the table; the worker calls evict() periodically
+    assert ExtractionCacheEntry.objects.count() == 3
+    assert extraction_cache.evict() == 1
+    assert sorted(ExtractionCacheEntry.objects.values_list('prompt', flat=True)) == ['three', 'two']
+
+    ExtractionCacheEntry.objects.filter(prompt='two').update(created_at=timezone.now() - timedelta(days=2))
+    extraction_cache.clear()
+    assert extraction_cache.get("two", 'mistral', today) is None
+    assert extraction_cache.evict() == 1
+    assert extraction_cache.get("three", 'mistral', today + timedelta(days=1)) is None
+
+
+def test_memory_hits_refresh_last_use_without_a_write_per_hit(db, settings, django_assert_num_queries):
+    settings.EXTRACTION_CACHE_TOUCH_SECONDS = 60
+    settings.EXTRACTION_CACHE_MAX_ENTRIES = 1
+    today = date.today()
+    extraction_cache.set("hot", 'mistral', today, {'title': "hot"})
+    ExtractionCacheEntry.objects.update(last_used_at=timezone.now() - timedelta(hours=1))
+    with django_assert_num_queries(0):
+        for _ in range(3):
+            assert extraction_cache.get("hot", 'mistral', today) == {'title': "hot"}
+
+    # Once the touch interval has passed, the next memory hit writes the pending hits through
+    key = next(reversed(extraction_cache._memory))
+    extraction_cache._memory[key][2] -= 60
+    with django_assert_num_queries(1):
+        extraction_cache.get("hot", 'mistral', today)
+    hot = ExtractionCacheEntry.objects.get()
+    assert hot.hits == 4
+    assert hot.last_used_at > timezone.now() - timedelta(minutes=1)
+
+    # The hot entry is now the most recently used, so a colder one is evicted first
+    extraction_cache.set("cold", 'mistral', today, {'title': "cold"})
+    ExtractionCacheEntry.objects.filter(prompt="cold").update(last_used_at=timezone.now() - timedelta(minutes=30))
+    assert extraction_cache.evict() == 1
+    assert ExtractionCacheEntry.objects.get().prompt == "hot"
@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tracker.models import Task
+from tracker.pagination import InvalidCursor, paginate_keyset
+
+import pytest
+
+
+@pytest.fixture
+def tasks(create_category):
+    today = date.today()
+    created = []
+    for i in range(7):
+        for priority in ('Low', 'High'):
+            created.append(Task.objects.create(
+                title=f"Task {i} {priority}",
+                description="",
+                category=create_category,
+                priority=priority,
+                due_date=today + timedelta(days=i % 3),
+                status='Not Started',
+            ))
+    return created
+
+
+def test_keyset_pages_cover_ordering(tasks):
+    expected = list(Task.objects.all())
+    seen = []
+    page = paginate_keyset(Task.objects.all(), page_size=4)
+    assert not page.has_previous
+    while True:
+        seen.extend(page)
+        if not page.has_next:
+            break
+        page = paginate_keyset(Task.objects.all(), cursor=page.next_cursor, page_size=4)
+    assert seen == expected
+
+
+def test_keyset_previous_page(tasks):
+    first = paginate_keyset(Task.objects.all(), page_size=5)
+    second = paginate_keyset(Task.objects.all(), cursor=first.next_cursor, page_size=5)
+    back = paginate_keyset(Task.objects.all(), cursor=second.previous_cursor, page_size=5)
+    assert list(back) == list(first)
+    assert not back.has_previous
+    assert back.next_cursor == first.next_cursor
+
+
+def test_keyset_page_is_one_query(tasks):
+    first = paginate_keyset(Task.objects.all(), page_size=3)
+    with CaptureQueriesContext(connection) as ctx:
+        paginate_keyset(Task.objects.all(), cursor=first.next_cursor, page_size=3)
+    assert len(ctx.captured_queries) == 1
+    assert 'OFFSET' not in ctx.captured_queries[0]['sql']
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', 'eyJwIjpbXSwiciI6MH0'])
+def test_invalid_cursor(db, cursor):
+    with pytest.raises(InvalidCursor):
+        paginate_keyset(Task.objects.all(), cursor=cursor)
+
+
+def test_default_ordering_uses_priority_rank(tasks):
+    first = paginate_keyset(Task.objects.all(), page_size=2)
+    assert [task.priority for task in first] == ['High', 'High']
+    assert Task.objects.filter(priority='Low').values_list('priority_rank', flat=True).first() == 1
+
+    Task.objects.filter(priority='Low').update(priority='Medium')
+    assert set(Task.objects.filter(priority='Medium').values_list('priority_rank', flat=True)) == {2}
+
+
+def test_api_orders_by_priority_rank(client, create_users, tasks):
+    admin, _, _ = create_users
+    client.force_login(admin)
+    response = client.get('/api/tasks/', {'ordering': '-priority,id', 'page_size': 8}, secure=True)
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert [task['priority'] for task in results] == ['High'] * 7 + ['Low']
+
+    response = client.get(response.json()['next'], secure=True)
+    assert [task['priority'] for task in response.json()['results']] == ['Low'] * 6
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from tracker.models import Task
+
+
+@pytest.fixture
+def tasks(create_users, create_category):
+    admin, user1, user2 = create_users
+    tasks = []
+    for i, priority in enumerate(['Low', 'High', 'Medium']):
+        task = Task.objects.create(
+            title=f"Survey, part {i}", description=f"Line one\nLine {i}", category=create_category,
+            priority=priority, due_date=date(2030, 1, 1) + timedelta(days=i), status='Not Started',
+            created_by=admin, assigned_by=admin,
+        )
+        if i:
+            task.assigned_to.add(user1, user2)
+        else:
+            task.assigned_to.add(user2)
+        tasks.append(task)
+    return tasks
+
+
+def download(response):
+    assert response.status_code == 200
+    assert 'attachment; filename="tasks-' in response['Content-Disposition']
+    return b''.join(response.streaming_content).decode()
+
+
+def test_csv_export_is_scoped_and_ordered_like_the_list(client, create_users, tasks, settings):
+    admin, user1, user2 = create_users
+    settings.EXPORT_CHUNK_SIZE = 1
+    client.force_login(user1)
+
+    body = download(client.get('/api/tasks/export/', {'ordering': 'priority'}, secure=True))
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert [row['title'] for row in rows] == ['Survey, part 2', 'Survey, part 1']
+    assert rows[0]['description'] == 'Line one\nLine 2'
+    assert rows[0]['assigned_to'] == 'user1;user2'
+    assert rows[0]['category'] == 'Bug' and rows[0]['due_date'] == '2030-01-03'
+    assert rows[0]['created_by'] == 'admin'
+
+
+def test_jsonl_export_and_reimport(client, create_users, tasks):
+    admin, user1, user2 = create_users
+    client.force_login(admin)
+    response = client.get('/api/tasks/export/', {'type': 'jsonl'}, secure=True)
+    assert response['Content-Type'] == 'application/x-ndjson'
+    body = download(response)
+    assert [json.loads(line)['id'] for line in body.splitlines()] == [tasks[2].id, tasks[1].id, tasks[0].id]
+
+    response = client.post('/api/tasks/import/', body, content_type='application/x-ndjson', secure=True)
+    summary = json.loads(b''.join(response.streaming_content).decode().splitlines()[-1])['summary']
+    assert summary['created'] == 3
+    assert Task.objects.filter(assigned_to=user1).count() == 4
+
+
+def test_export_rejects_unknown_type(client, create_users):
+    client.force_login(create_users[0])
+    assert client.get('/api/tasks/export/', {'type': 'xml'}, secure=True).status_code == 400
@@ -0,0 +1,33 @@
+from datetime import date
+
+from tracker.models import Task, TaskHistory
+
+
+def test_status_update_appends_history(client, create_users, create_category):
+    admin, user1, _ = create_users
+    task = Task.objects.create(
+        title="A", description="", category=create_category, priority='Low',
+        due_date=date.today(), status='Not Started',
+    )
+    task.assigned_to.add(user1)
+    client.force_login(user1)
+
+    for status in ('In Progress', 'Submitted for Approval', 'Approved'):
+        response = client.post(f'/api/task/{task.id}/update-status/', {'status': status}, secure=True)
+        assert response.status_code == 302
+
+    entries = list(TaskHistory.objects.filter(task=task).values_list('old_status', 'new_status', 'actor'))
+    assert entries == [
+        ('Submitted for Approval', 'Approved', user1.id),
+        ('In Progress', 'Submitted for Approval', user1.id),
+        ('Not Started', 'In Progress', user1.id),
+    ]
+
+    response = client.get(f'/api/tasks/{task.id}/history/', {'page_size': 2}, secure=True)
+    body = response.json()
+    assert [entry['new_status'] for entry in body['results']] == ['Approved', 'Submitted for Approval']
+    assert body['results'][0]['actor'] == 'user1'
+    response = client.get(body['next'], secure=True)
+    assert [entry['new_status'] for entry in response.json()['results']] == ['In Progress']
+
+    assert 'history_log' not in client.get(f'/api/tasks/{task.id}/', secure=True).json()
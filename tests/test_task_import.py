@@ -0,0 +1,78 @@
+import json
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from tracker.models import Task
+
+CSV_DOCUMENT = (
+    "title,description,category,priority,status,due_date,assigned_to\n"
+    "Survey car,Front bumper,Bug,high,,2030-01-15,user1;user2\n"
+    "\"Multi-line, quoted\",\"Line one\nLine two\",bug,Low,Approved,01/20/2030,\n"
+    ",Missing title,Bug,Medium,,2030-01-15,\n"
+    "Bad values,Unknown things,Nope,Urgent,,someday 2030-01-15 maybe,ghost\n"
+)
+
+
+def read_events(response):
+    assert response['Content-Type'] == 'application/x-ndjson'
+    return [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+
+
+def test_csv_import_creates_valid_rows_and_streams_errors(client, create_users, create_category):
+    admin, user1, user2 = create_users
+    client.force_login(admin)
+    response = client.post('/api/tasks/import/', CSV_DOCUMENT, content_type='text/csv', secure=True)
+
+    events = read_events(response)
+    errors = {event['line']: event['errors'] for event in events if 'errors' in event}
+    assert errors[5] == {'title': ['This field is required.']}
+    assert set(errors[6]) == {'category', 'priority', 'due_date', 'assigned_to'}
+    assert events[-1]['summary']['created'] == 2
+    assert events[-1]['summary']['failed'] == 2
+
+    survey = Task.objects.get(title='Survey car')
+    assert survey.priority == 'High' and survey.priority_rank == 3
+    assert survey.status == 'Not Started'
+    assert set(survey.assigned_to.all()) == {user1, user2}
+    quoted = Task.objects.get(title='Multi-line, quoted')
+    assert quoted.description == 'Line one\nLine two'
+    assert str(quoted.due_date) == '2030-01-20'
+    assert quoted.created_by == admin
+
+    create_category.refresh_from_db()
+    assert (create_category.total_tasks, create_category.open_tasks, create_category.approved_tasks) == (2, 1, 1)
+
+
+def test_jsonl_upload_is_imported_in_batches(client, create_users, create_category, settings):
+    admin, user1, user2 = create_users
+    settings.BULK_INSERT_BATCH_SIZE = 2
+    lines = [
+        json.dumps({'title': f'Task {i}', 'description': 'Imported', 'category': create_category.id,
+                    'due_date': '2030-02-01', 'assigned_to': ['user1']})
+        for i in range(5)
+    ]
+    lines.insert(2, '{not json')
+    upload = SimpleUploadedFile('tasks.jsonl', '\n'.join(lines).encode())
+    client.force_login(user1)
+    response = client.post('/api/tasks/import/', {'file': upload}, secure=True)
+
+    events = read_events(response)
+    assert [event['created'] for event in events if 'created' in event and 'rows' in event] == [2, 3, 5]
+    errors = [event for event in events if 'errors' in event]
+    assert len(errors) == 1 and errors[0]['line'] == 3
+    assert errors[0]['errors']['non_field_errors'][0].startswith('Invalid JSON')
+    assert events[-1]['summary']['created'] == 5
+    assert Task.objects.filter(assigned_to=user1).count() == 5
+
+
+def test_import_row_limit_and_unsupported_type(client, create_users, create_category, settings):
+    admin, user1, user2 = create_users
+    settings.BULK_IMPORT_MAX_ROWS = 1
+    client.force_login(admin)
+    response = client.post('/api/tasks/import/', CSV_DOCUMENT, content_type='text/csv', secure=True)
+    events = read_events(response)
+    assert events[-2] == {'error': 'Import stopped: more than 1 rows'}
+    assert Task.objects.count() == 1
+
+    response = client.post('/api/tasks/import/', 'x', content_type='application/xml', secure=True)
+    assert response.status_code == 415
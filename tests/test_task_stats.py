@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tracker.models import Task, Role, Category
+from tracker.stats import TASK_COUNTS_VERSION_KEY, get_task_stats, get_pending_counts_by_category
+
+
+def make_task(category, title, status, due_date, assigned_by=None, assigned_to=()):
+    task = Task.objects.create(
+        title=title,
+        description=title,
+        category=category,
+        priority='Medium',
+        due_date=due_date,
+        status=status,
+        assigned_by=assigned_by,
+    )
+    task.assigned_to.set(assigned_to)
+    return task
+
+
+def test_stats_single_query(create_users, create_category):
+    admin, user1, user2 = create_users
+    today = date.today()
+    make_task(create_category, "A", 'In Progress', today - timedelta(days=1), assigned_to=[user1])
+    make_task(create_category, "B", 'Approved', today + timedelta(days=3), assigned_to=[user1])
+    make_task(create_category, "C", 'Not Started', today + timedelta(days=3), assigned_to=[user2])
+
+    with CaptureQueriesContext(connection) as ctx:
+        stats = get_task_stats(admin)
+
+    assert len(ctx.captured_queries) == 1
+    assert stats['total'] == 3
+    assert stats['in_progress'] == 1
+    assert stats['approved'] == 1
+    assert stats['not_started'] == 1
+    assert stats['overdue'] == 1
+
+
+def test_stats_scoped_by_role(create_users, create_category):
+    admin, user1, user2 = create_users
+    Role.objects.create(user=user2, role_type='Team Leader')
+    today = date.today()
+    make_task(create_category, "A", 'In Progress', today, assigned_by=user2, assigned_to=[user1])
+    make_task(create_category, "B", 'Approved', today, assigned_to=[user2])
+
+    assert get_task_stats(user1)['total'] == 1
+    leader_stats = get_task_stats(user2)
+    assert leader_stats['total'] == 1
+    assert leader_stats['approved'] == 0
+
+
+def test_pending_counts_grouped_and_invalidated(create_users, create_category):
+    admin, user1, user2 = create_users
+    other = Category.objects.create(name="Feature")
+    today = date.today()
+    make_task(create_category, "A", 'In Progress', today, assigned_to=[user1])
+    make_task(create_category, "B", 'Approved', today, assigned_to=[user1])
+    task = make_task(other, "C", 'Not Started', today, assigned_to=[user2])
+
+    with CaptureQueriesContext(connection) as ctx:
+        counts = get_pending_counts_by_category(user1)
+        assert get_pending_counts_by_category(user1) == counts
+    assert counts == {create_category.id: 1}
+    # One role lookup plus one grouped count; the second call is served from cache
+    assert len(ctx.captured_queries) == 2
+
+    task.assigned_to.add(user1)
+    assert get_pending_counts_by_category(user1) == {create_category.id: 1, other.id: 1}
+
+
+def test_visible_to_eager_loads_relations(create_users, create_category):
+    admin, user1, user2 = create_users
+    Role.objects.create(user=user2, role_type='Team Leader')
+    make_task(create_category, "A", 'In Progress', date.today(), assigned_by=user2, assigned_to=[user1])
+    make_task(create_category, "B", 'In Progress', date.today(), assigned_by=user2, assigned_to=[user1, admin])
+    make_task(create_category, "C", 'In Progress', date.today(), assigned_to=[admin])
+
+    leader = User.objects.get(pk=user2.pk)
+    with CaptureQueriesContext(connection) as ctx:
+        tasks = list(Task.objects.visible_to(leader))
+        names = [(t.category.name, t.assigned_by.username, len(t.assigned_to.all())) for t in tasks]
+        Task.objects.visible_to(leader).count()
+
+    assert sorted(names) == [("Bug", "user2", 1), ("Bug", "user2", 2)]
+    # Role lookup, tasks with joins, assignee prefetch, count; the role is not re-fetched
+    assert len(ctx.captured_queries) == 4
+
+
+def test_explain_command_leaves_cached_counts_alone(create_users, create_category):
+    admin, user1, user2 = create_users
+    make_task(create_category, "A", 'In Progress', date.today(), assigned_to=[user1])
+    get_pending_counts_by_category(user1)
+    version = cache.get(TASK_COUNTS_VERSION_KEY)
+
+    out = StringIO()
+    call_command('explain_task_queries', '--user', user1.username, stdout=out)
+    assert "Pending counts per category" in out.getvalue()
+    assert cache.get(TASK_COUNTS_VERSION_KEY) == version
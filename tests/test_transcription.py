@@ -0,0 +1,56 @@
+import sys
+import types
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from tracker import transcription
+from tracker.transcription import get_transcription_stats, warm_up_whisper
+from tracker.utils import transcribe_audio
+
+
+class FakeModel:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+
+    def transcribe(self, audio):
+        self.calls += 1
+        return {'text': f"heard {self.name}"}
+
+
+@pytest.fixture
+def fake_whisper(monkeypatch):
+    """Stand-in for the whisper package that records every model load"""
+    module = types.ModuleType('whisper')
+    module.loads = []
+
+    def load_model(name):
+        module.loads.append(name)
+        return FakeModel(name)
+
+    module.load_model = load_model
+    monkeypatch.setitem(sys.modules, 'whisper', module)
+    monkeypatch.setattr(transcription, '_whisper_models', {})
+    monkeypatch.setattr('tracker.utils.load_audio', lambda audio_file: [0.0] * 16000)
+    return module
+
+
+def test_model_is_loaded_once_per_process(fake_whisper, settings):
+    settings.WHISPER_MODEL = 'tiny'
+    before = get_transcription_stats()
+
+    for _ in range(3):
+        assert transcribe_audio(SimpleUploadedFile('note.wav', b'RIFF')) == "heard tiny"
+
+    assert fake_whisper.loads == ['tiny']
+    stats = get_transcription_stats()
+    assert stats['model_loads'] - before['model_loads'] == 1
+    assert stats['transcriptions'] - before['transcriptions'] == 3
+
+
+def test_warm_up_loads_configured_model(fake_whisper, settings):
+    settings.WHISPER_MODEL = 'small'
+    assert warm_up_whisper()
+    transcribe_audio(SimpleUploadedFile('note.wav', b'RIFF'))
+    assert fake_whisper.loads == ['small']
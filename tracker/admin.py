@@ -1,27 +1,37 @@
+from datetime import date
+
 from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db.models import BooleanField, Case, Prefetch, Value, When
 from django.utils.html import format_html
-from .models import Task, Category, Role, Profile
+from .models import Task, TaskHistory, OutboxMessage, ExtractionCacheEntry, AITaskJob, Category, Role, Profile
+from .pagination import EstimatedCountPaginator
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'description', 'task_count')
+    list_display = ('name', 'description', 'task_count', 'open_tasks', 'approved_tasks', 'overdue_tasks')
     search_fields = ('name', 'description')
+    readonly_fields = ('total_tasks', 'open_tasks', 'approved_tasks', 'overdue_tasks')
     
     def task_count(self, obj):
-        count = obj.number_of_tasks()
+        count = obj.total_tasks
         return format_html('<span style="color: {}">{}</span>', 
                           'green' if count > 0 else 'gray', 
                           count)
     task_count.short_description = 'Tasks'
+    task_count.admin_order_field = 'total_tasks'
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ('title', 'category', 'priority', 'due_date', 'status', 'assigned_users', 'is_overdue_status')
     list_filter = ('status', 'priority', 'category', 'due_date')
+    list_select_related = ('category',)
     search_fields = ('title', 'description', 'comments')
     date_hierarchy = 'due_date'
-    filter_horizontal = ('assigned_to',)
-    readonly_fields = ('history_log',)
+    autocomplete_fields = ('created_by', 'assigned_by', 'assigned_to')
+    # Avoid a second COUNT(*) over the whole table on filtered changelists
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     fieldsets = (
         ('Basic Information', {
             'fields': ('title', 'description', 'category', 'priority', 'status')
@@ -33,20 +43,71 @@ class TaskAdmin(admin.ModelAdmin):
             'fields': ('created_by', 'assigned_by', 'assigned_to')
         }),
         ('Additional Information', {
-            'fields': ('comments', 'attachments', 'history_log'),
+            'fields': ('comments', 'attachments'),
             'classes': ('collapse',)
         }),
     )
     
+    def get_queryset(self, request):
+        """Prefetch assignee names and compute overdue in SQL for the changelist"""
+        return super().get_queryset(request).prefetch_related(
+            Prefetch('assigned_to', queryset=User.objects.only('id', 'username'))
+        ).annotate(
+            is_overdue_flag=Case(
+                When(due_date__lt=date.today(), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+        )
+    
     def assigned_users(self, obj):
         return ", ".join([user.username for user in obj.assigned_to.all()])
     assigned_users.short_description = 'Assigned To'
     
     def is_overdue_status(self, obj):
-        if obj.is_overdue():
+        if obj.is_overdue_flag:
             return format_html('<span style="color: red;">Overdue</span>')
         return format_html('<span style="color: green;">On time</span>')
     is_overdue_status.short_description = 'Status'
+    is_overdue_status.admin_order_field = 'is_overdue_flag'
+
+@admin.register(TaskHistory)
+class TaskHistoryAdmin(admin.ModelAdmin):
+    list_display = ('task', 'old_status', 'new_status', 'actor', 'created_at')
+    list_filter = ('new_status',)
+    list_select_related = ('task', 'actor')
+    raw_id_fields = ('task', 'actor')
+    date_hierarchy = 'created_at'
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('to_number', 'recipient', 'task', 'new_status', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    list_select_related = ('recipient', 'task')
+    raw_id_fields = ('recipient', 'task')
+    search_fields = ('to_number', 'provider_id')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+@admin.register(ExtractionCacheEntry)
+class ExtractionCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ('prompt', 'model_name', 'reference_date', 'hits', 'created_at', 'last_used_at')
+    list_filter = ('model_name', 'reference_date')
+    search_fields = ('prompt',)
+    readonly_fields = ('key', 'model_name', 'reference_date', 'prompt', 'result', 'hits', 'created_at', 'last_used_at')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+@admin.register(AITaskJob)
+class AITaskJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'created_by', 'status', 'progress', 'task', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    list_select_related = ('created_by', 'task')
+    raw_id_fields = ('created_by', 'task')
+    filter_horizontal = ('assigned_to',)
+    search_fields = ('prompt', 'created_by__username')
 
 @admin.register(Role)
 class RoleAdmin(admin.ModelAdmin):
@@ -0,0 +1,183 @@
+# tracker/ai_jobs.py
+import logging
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .audio import AudioError
+from .models import AITaskJob, Category, Task, PRIORITY_CHOICES
+from .utils import generate_task_from_prompt, transcribe_audio
+
+logger = logging.getLogger('tracker')
+
+
+class AIJobError(Exception):
+    """Raised when a job cannot produce a task; the message is shown to the user"""
+
+
+def create_task_from_ai_data(task_data, prompt, user, title='', priority='', due_date=None, assigned_to=()):
+    """
+    Create a task from AI-extracted details, applying the user's overrides.
+
+    Args:
+        task_data (dict): Details returned by ``generate_task_from_prompt``
+        prompt (str): The prompt the details were extracted from
+        user: The user creating the task (becomes creator and assigner)
+        title: Title override (blank to use the AI suggestion)
+        priority: Priority override (blank to use the AI suggestion)
+        due_date: Due date override (None to use the AI suggestion)
+        assigned_to: Users to assign (defaults to the creator)
+
+    Returns:
+        Task: The saved task
+    """
+    with transaction.atomic():
+        task = Task()
+        task.title = title or task_data.get('title', 'Untitled Task')
+        task.description = task_data.get('description', prompt)
+
+        # Get category from AI suggestion, defaulting to the first category
+        category_id = task_data.get('category_id', 1)
+        try:
+            task.category = Category.objects.get(id=category_id)
+        except (Category.DoesNotExist, ValueError, TypeError):
+            task.category = Category.objects.first()
+
+        ai_priority = task_data.get('priority', 'Medium')
+        if ai_priority not in dict(PRIORITY_CHOICES):
+            ai_priority = 'Medium'
+        task.priority = priority or ai_priority
+
+        if due_date:
+            task.due_date = due_date
+            logger.info(f"Using user-provided due date: {task.due_date}")
+        elif task_data.get('due_date'):
+            task.due_date = task_data['due_date']
+            logger.info(f"Using AI-suggested due date: {task.due_date}")
+        else:
+            task.due_date = date.today() + timedelta(days=7)
+            logger.info(f"Using default due date (7 days from now): {task.due_date}")
+
+        task.status = 'Not Started'
+        task.created_by = user
+        task.assigned_by = user
+        task.save()
+
+        if assigned_to:
+            task.assigned_to.set(assigned_to)
+        else:
+            # Default to assigning the creator
+            task.assigned_to.add(user)
+
+    logger.info(f"AI-generated task created: '{task.title}' by {user.username}")
+    return task
+
+
+def _set_progress(job, progress):
+    job.progress = progress
+    AITaskJob.objects.filter(pk=job.pk).update(progress=progress)
+
+
+def run_ai_job(job):
+    """
+    Transcribe, extract and create the task for one claimed job.
+
+    The outcome (``done`` with the task, or ``failed`` with an error) is
+    saved on the job; exceptions are not propagated. If ``fail_stuck_jobs``
+    already gave up on the job, its ``failed`` state is left alone.
+    """
+    try:
+        prompt = job.prompt
+        if job.audio_data and not prompt:
+            _set_progress(job, "Transcribing audio")
+            try:
+                prompt = transcribe_audio(ContentFile(bytes(job.audio_data), name=job.audio_name))
+            except AudioError as e:
+                raise AIJobError(str(e))
+            if not prompt:
+                raise AIJobError("Failed to transcribe audio. Please try again or enter text directly.")
+            job.prompt = prompt
+
+        _set_progress(job, "Extracting task details")
+        task_data = generate_task_from_prompt(prompt)
+        if not task_data:
+            raise AIJobError("Failed to generate task from prompt. Please try again with a clearer description.")
+
+        _set_progress(job, "Creating task")
+        job.task = create_task_from_ai_data(
+            task_data,
+            prompt,
+            job.created_by,
+            title=job.title,
+            priority=job.priority,
+            due_date=job.due_date,
+            assigned_to=list(job.assigned_to.all()),
+        )
+        job.status = 'done'
+        job.progress = "Task created"
+    except Exception as e:
+        if not isinstance(e, AIJobError):
+            logger.exception(f"AI task job {job.id} failed")
+        job.status = 'failed'
+        job.error = str(e)
+    finally:
+        job.audio_data = b''
+        job.finished_at = timezone.now()
+        # Only a job that is still running is ours to finish; a reaped one stays failed
+        saved = AITaskJob.objects.filter(pk=job.pk, status='running').update(
+            prompt=job.prompt, audio_data=job.audio_data, task=job.task, status=job.status,
+            progress=job.progress, error=job.error, finished_at=job.finished_at,
+        )
+        if not saved:
+            logger.warning(f"AI task job {job.id} finished ({job.status}) after it was marked failed")
+            job.refresh_from_db()
+            return job
+    logger.info(f"AI task job {job.id} finished: {job.status}")
+    return job
+
+
+def run_ai_job_in_thread(job):
+    """Run a job on a worker thread, which needs its own database connection"""
+    close_old_connections()
+    try:
+        return run_ai_job(job)
+    finally:
+        connection.close()
+
+
+def fail_stuck_jobs(now=None):
+    """
+    Mark jobs that have been running longer than ``AI_JOB_TIMEOUT_SECONDS`` as failed.
+
+    A worker that dies mid-job leaves it running forever; such jobs are
+    failed rather than retried, because the task may already exist.
+
+    Returns:
+        int: The number of jobs marked failed
+    """
+    now = now or timezone.now()
+    return AITaskJob.objects.filter(
+        status='running',
+        started_at__lt=now - timedelta(seconds=settings.AI_JOB_TIMEOUT_SECONDS),
+    ).update(status='failed', error="The job took too long and was stopped.", finished_at=now)
+
+
+def claim_ai_jobs(limit, now=None):
+    """
+    Mark up to ``limit`` queued jobs as running and return them, oldest first.
+
+    On PostgreSQL jobs locked by another worker are skipped rather than waited for.
+    """
+    if limit <= 0:
+        return []
+    now = now or timezone.now()
+    with transaction.atomic():
+        queued = AITaskJob.objects.filter(status='queued').order_by('created_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+        ids = list(queued.values_list('id', flat=True)[:limit])
+        AITaskJob.objects.filter(id__in=ids).update(status='running', started_at=now, progress="Starting")
+    return list(AITaskJob.objects.filter(id__in=ids).select_related('created_by').order_by('created_at', 'id'))
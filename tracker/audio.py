@@ -0,0 +1,178 @@
+# tracker/audio.py
+import logging
+import subprocess
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger('tracker')
+
+# Whisper expects 16 kHz mono audio; ffmpeg emits it as signed 16-bit little-endian samples
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+READ_SIZE = 64 * 1024
+# How much of ffmpeg's error output is kept for the error message
+STDERR_TAIL_BYTES = 4096
+
+
+class AudioError(ValueError):
+    """Raised when an uploaded voice note cannot be used; the message is shown to the user"""
+
+
+class AudioTooLarge(AudioError):
+    pass
+
+
+class AudioTooLong(AudioError):
+    pass
+
+
+class AudioDecodeError(AudioError):
+    pass
+
+
+def local_path(audio_file):
+    """Return a filesystem path for an uploaded or stored file, or None if it only exists in memory"""
+    if hasattr(audio_file, 'temporary_file_path'):
+        return audio_file.temporary_file_path()
+    try:
+        return audio_file.path
+    except (AttributeError, NotImplementedError, ValueError):
+        return None
+
+
+def _feed(stdin, chunks, max_bytes, state):
+    """Write upload chunks to ffmpeg's stdin, stopping at the size limit"""
+    try:
+        for chunk in chunks:
+            state['bytes_in'] += len(chunk)
+            if state['bytes_in'] > max_bytes:
+                state['too_large'] = True
+                break
+            stdin.write(chunk)
+    except (BrokenPipeError, ValueError):
+        # ffmpeg exited early (bad input, or we stopped reading at the duration limit)
+        pass
+    finally:
+        try:
+            stdin.close()
+        except (BrokenPipeError, ValueError):
+            pass
+
+
+def _drain(pipe, tail):
+    """Read ffmpeg's stderr until it closes, keeping only the last ``STDERR_TAIL_BYTES``"""
+    try:
+        for data in iter(lambda: pipe.read(READ_SIZE), b''):
+            tail += data
+            del tail[:-STDERR_TAIL_BYTES]
+    except (OSError, ValueError):
+        # The pipe was closed while bailing out early
+        pass
+
+
+def decode_to_pcm(audio_file, max_bytes=None, max_seconds=None):
+    """
+    Decode an audio upload into 16 kHz mono 16-bit PCM with ffmpeg, in memory.
+
+    Files already on disk (large uploads, stored job files) are read by
+    ffmpeg directly; in-memory uploads are streamed to its stdin chunk by
+    chunk. The decoded output is read into a buffer that is never allowed
+    to grow past ``max_seconds`` of audio. ffmpeg's stderr is drained on
+    its own thread, so a corrupt file that logs an error per frame cannot
+    fill the pipe and stall the decode.
+
+    Args:
+        audio_file: An uploaded file or a stored ``FieldFile``
+        max_bytes: Largest accepted upload (defaults to ``AUDIO_MAX_UPLOAD_BYTES``)
+        max_seconds: Longest accepted recording (defaults to ``AUDIO_MAX_SECONDS``)
+
+    Returns:
+        bytes: The decoded samples
+
+    Raises:
+        AudioTooLarge: If the upload is bigger than ``max_bytes``
+        AudioTooLong: If the audio is longer than ``max_seconds``
+        AudioDecodeError: If ffmpeg is missing or cannot decode the file
+    """
+    max_bytes = max_bytes or settings.AUDIO_MAX_UPLOAD_BYTES
+    max_seconds = max_seconds or settings.AUDIO_MAX_SECONDS
+    size = getattr(audio_file, 'size', None)
+    if size is not None and size > max_bytes:
+        raise AudioTooLarge(f"Audio file is larger than {max_bytes // (1024 * 1024)} MB")
+
+    path = local_path(audio_file)
+    command = [
+        settings.FFMPEG_BINARY, '-nostdin', '-hide_banner', '-loglevel', 'error',
+        '-i', path or 'pipe:0',
+        '-f', 's16le', '-ac', '1', '-ar', str(SAMPLE_RATE), 'pipe:1',
+    ]
+    try:
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL if path else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except OSError as e:
+        raise AudioDecodeError(f"Could not run ffmpeg: {e}")
+
+    limit = max_seconds * SAMPLE_RATE * BYTES_PER_SAMPLE
+    state = {'bytes_in': 0, 'too_large': False}
+    feeder = None
+    pcm = bytearray()
+    stderr_tail = bytearray()
+    drainer = threading.Thread(target=_drain, args=(process.stderr, stderr_tail), name='audio-stderr', daemon=True)
+    drainer.start()
+    try:
+        if not path:
+            feeder = threading.Thread(
+                target=_feed,
+                args=(process.stdin, audio_file.chunks(), max_bytes, state),
+                name='audio-feed',
+                daemon=True,
+            )
+            feeder.start()
+
+        while True:
+            data = process.stdout.read(READ_SIZE)
+            if not data:
+                break
+            if len(pcm) + len(data) > limit:
+                raise AudioTooLong(f"Audio is longer than {max_seconds} seconds")
+            pcm += data
+
+        if feeder:
+            feeder.join()
+        if state['too_large']:
+            raise AudioTooLarge(f"Audio file is larger than {max_bytes // (1024 * 1024)} MB")
+        if process.wait() != 0 or not pcm:
+            drainer.join()
+            error = stderr_tail.decode(errors='replace').strip()
+            raise AudioDecodeError(f"Could not decode audio: {error or 'no audio found'}")
+    finally:
+        # Always stop ffmpeg and release its pipes, even when bailing out early
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        drainer.join()
+        for pipe in (process.stdin, process.stdout, process.stderr):
+            if pipe:
+                pipe.close()
+        if feeder:
+            feeder.join()
+
+    logger.info(f"Decoded {len(pcm) / (SAMPLE_RATE * BYTES_PER_SAMPLE):.1f}s of audio from {path or 'upload stream'}")
+    return bytes(pcm)
+
+
+def pcm_to_float32(pcm):
+    """Convert 16-bit PCM into the float32 samples in [-1, 1] that Whisper accepts"""
+    import numpy as np
+
+    return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+
+
+def load_audio(audio_file):
+    """Decode an upload into a 16 kHz mono float32 array for Whisper"""
+    return pcm_to_float32(decode_to_pcm(audio_file))
@@ -0,0 +1,322 @@
+# tracker/bulk.py
+import codecs
+import csv
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .dates import parse_due_date
+from .extraction import iter_batches
+from .models import (
+    PRIORITY_CHOICES, STATUS_CHOICES, Category, Task, TaskHistory, apply_category_counter_deltas,
+    task_counter_values,
+)
+
+logger = logging.getLogger('tracker')
+
+# Case-insensitive lookups of the stored choice values
+PRIORITY_VALUES = {value.lower(): value for value, _label in PRIORITY_CHOICES}
+STATUS_VALUES = {value.lower(): value for value, _label in STATUS_CHOICES}
+
+
+def bulk_create_tasks(tasks, assignees=None, batch_size=None):
+    """
+    Insert many tasks with batched INSERTs and keep derived data in sync.
+
+    ``bulk_create`` skips ``save()`` and the post_save signals, so this
+    does their work in bulk instead: priority ranks (via
+    ``TaskQuerySet.bulk_create``), Category counters, the ``assigned_to``
+    through rows and the cached per-user counts.
+
+    Args:
+        tasks: Unsaved Task objects
+        assignees: Optional list parallel to ``tasks`` of user ids to assign
+            to each task
+        batch_size: Rows per INSERT (defaults to ``BULK_INSERT_BATCH_SIZE``)
+
+    Returns:
+        list: The created tasks, with primary keys set
+    """
+    from .stats import invalidate_task_counts
+
+    batch_size = batch_size or settings.BULK_INSERT_BATCH_SIZE
+    today = date.today()
+    due_date_field = Task._meta.get_field('due_date')
+
+    with transaction.atomic():
+        created = Task.objects.bulk_create(tasks, batch_size=batch_size)
+
+        if assignees:
+            through = Task.assigned_to.through
+            links = [
+                through(task_id=task.pk, user_id=user_id)
+                for task, user_ids in zip(created, assignees)
+                for user_id in set(user_ids or ())
+            ]
+            through.objects.bulk_create(links, batch_size=batch_size)
+
+        deltas = defaultdict(Counter)
+        for task in created:
+            due_date = due_date_field.to_python(task.due_date)
+            deltas[task.category_id].update(task_counter_values(task.status, due_date, today))
+        apply_category_counter_deltas(deltas)
+
+        transaction.on_commit(invalidate_task_counts)
+
+    logger.info(f"Bulk created {len(created)} tasks")
+    return created
+
+
+# Columns accepted by the task import; anything else in a row is ignored
+IMPORT_FIELDS = ('title', 'description', 'category', 'priority', 'status', 'due_date', 'assigned_to', 'comments')
+
+
+def read_import_rows(lines, fmt):
+    """
+    Parse an uploaded CSV or JSONL document one row at a time.
+
+    Args:
+        lines: Iterable of byte lines (an uploaded file or the request body)
+        fmt: 'csv' (with a header row) or 'jsonl' (one JSON object per line)
+
+    Yields:
+        tuple: ``(line number, dict of values)``, or ``(line number, error message)``
+        for rows that cannot be parsed
+    """
+    text = codecs.iterdecode(lines, 'utf-8-sig')
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        reader.fieldnames  # Reads the header
+        # Quoted values may span lines, so report the line each record starts on
+        start = reader.line_num + 1
+        for row in reader:
+            # DictReader stores surplus values under the None key
+            row.pop(None, None)
+            yield start, row
+            start = reader.line_num + 1
+        return
+
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, "Each line must be a JSON object"
+            continue
+        yield number, row
+
+
+class TaskImporter:
+    """
+    Validate imported task rows in batches and insert them with ``bulk_create_tasks``.
+
+    Rows are read lazily and only one batch is held at a time, so the
+    memory used does not grow with the size of the upload. Categories are
+    loaded once and assignee usernames are resolved with one query per
+    batch instead of one per row.
+    """
+
+    def __init__(self, user, batch_size=None, max_rows=None):
+        self.user = user
+        self.batch_size = batch_size or settings.BULK_INSERT_BATCH_SIZE
+        self.max_rows = max_rows or settings.BULK_IMPORT_MAX_ROWS
+        self.today = date.today()
+        self.user_ids = {}
+        self.category_ids = {}
+        for category_id, name in Category.objects.values_list('id', 'name'):
+            self.category_ids[str(category_id)] = category_id
+            self.category_ids.setdefault(name.strip().lower(), category_id)
+        self.stats = {'rows': 0, 'created': 0, 'failed': 0}
+
+    def run(self, rows):
+        """
+        Import parsed rows (see ``read_import_rows``).
+
+        Yields:
+            dict: ``{'line': n, 'errors': {...}}`` for each rejected row,
+            ``{'rows': n, 'created': n}`` after each inserted batch and
+            ``{'summary': {...}}`` at the end
+        """
+        started = time.perf_counter()
+        for batch in iter_batches(rows, self.batch_size):
+            remaining = self.max_rows - self.stats['rows']
+            over_limit = len(batch) > remaining
+            batch = batch[:remaining]
+            if batch:
+                self.stats['rows'] += len(batch)
+                yield from self.import_batch(batch)
+                yield {'rows': self.stats['rows'], 'created': self.stats['created']}
+            if over_limit:
+                yield {'error': f"Import stopped: more than {self.max_rows} rows"}
+                break
+
+        self.stats['seconds'] = round(time.perf_counter() - started, 3)
+        logger.info(
+            f"{self.user.username} imported {self.stats['created']} of {self.stats['rows']} tasks "
+            f"in {self.stats['seconds']}s ({self.stats['failed']} rejected)"
+        )
+        yield {'summary': dict(self.stats)}
+
+    def import_batch(self, batch):
+        self.resolve_usernames(
+            name for _, row in batch if isinstance(row, dict) for name in self.usernames(row)
+        )
+        tasks, assignees = [], []
+        for number, row in batch:
+            if isinstance(row, dict):
+                task, user_ids, errors = self.build_task(row)
+            else:
+                errors = {'non_field_errors': [row]}
+            if errors:
+                self.stats['failed'] += 1
+                yield {'line': number, 'errors': errors}
+                continue
+            tasks.append(task)
+            assignees.append(user_ids)
+
+        if tasks:
+            bulk_create_tasks(tasks, assignees=assignees, batch_size=self.batch_size)
+            self.stats['created'] += len(tasks)
+
+    @staticmethod
+    def usernames(row):
+        value = row.get('assigned_to') or []
+        if isinstance(value, str):
+            value = value.replace(',', ';').split(';')
+        return [str(name).strip() for name in value if str(name).strip()]
+
+    def resolve_usernames(self, names):
+        missing = set(names) - self.user_ids.keys()
+        if missing:
+            found = dict(User.objects.filter(username__in=missing).values_list('username', 'id'))
+            for name in missing:
+                self.user_ids[name] = found.get(name)
+
+    def build_task(self, row):
+        """
+        Validate one row.
+
+        Returns:
+            tuple: ``(Task, assignee ids, errors)``; ``errors`` is a dict of
+            field name to messages and empty when the row is valid
+        """
+        errors = {}
+        values = {field: str(row.get(field) or '').strip() for field in IMPORT_FIELDS if field != 'assigned_to'}
+
+        if not values['title']:
+            errors['title'] = ["This field is required."]
+        elif len(values['title']) > Task._meta.get_field('title').max_length:
+            errors['title'] = ["Ensure this field has no more than 200 characters."]
+        if not values['description']:
+            errors['description'] = ["This field is required."]
+
+        category_id = self.category_ids.get(values['category'].lower())
+        if category_id is None:
+            errors['category'] = [f"Unknown category '{values['category']}'."]
+
+        priority = PRIORITY_VALUES.get((values['priority'] or 'Medium').lower())
+        if priority is None:
+            errors['priority'] = [f"'{values['priority']}' is not a valid priority."]
+        task_status = STATUS_VALUES.get((values['status'] or 'Not Started').lower())
+        if task_status is None:
+            errors['status'] = [f"'{values['status']}' is not a valid status."]
+
+        due_date = parse_due_date(values['due_date'], self.today, fallback=False)
+        if not values['due_date']:
+            errors['due_date'] = ["This field is required."]
+        elif due_date is None:
+            errors['due_date'] = [f"'{values['due_date']}' is not a valid date."]
+
+        user_ids = []
+        for name in self.usernames(row):
+            if self.user_ids.get(name) is None:
+                errors.setdefault('assigned_to', []).append(f"Unknown user '{name}'.")
+            else:
+                user_ids.append(self.user_ids[name])
+
+        if errors:
+            return None, None, errors
+        task = Task(
+            title=values['title'],
+            description=values['description'],
+            category_id=category_id,
+            priority=priority,
+            status=task_status,
+            due_date=due_date,
+            comments=values['comments'],
+            created_by=self.user,
+            assigned_by=self.user,
+        )
+        return task, user_ids, {}
+
+
+def bulk_update_status(user, task_ids, new_status):
+    """
+    Move many tasks to ``new_status`` in one transaction.
+
+    Permissions for all ids are checked in the same query that locks the
+    tasks, the status is written with a single UPDATE, and the history
+    entries and outbox messages are inserted in bulk. Category counters
+    are adjusted with one UPDATE per affected category.
+
+    Args:
+        user: The user making the change
+        task_ids: Ids of the tasks to update
+        new_status: One of the Task status values
+
+    Returns:
+        dict: ``updated`` (ids changed), ``unchanged`` (ids already in that
+        status) and ``not_permitted`` (ids missing or not editable by the user)
+    """
+    from .notifications import queue_bulk_status_change_notifications
+    from .stats import invalidate_task_counts
+
+    task_ids = set(task_ids)
+    today = date.today()
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.status_editable_by(user).filter(id__in=task_ids)
+            .only('id', 'title', 'status', 'category_id', 'due_date')
+            .select_for_update()
+        )
+        changed = [task for task in tasks if task.status != new_status]
+        result = {
+            'updated': sorted(task.id for task in changed),
+            'unchanged': sorted(task.id for task in tasks if task.status == new_status),
+            'not_permitted': sorted(task_ids - {task.id for task in tasks}),
+        }
+        if not changed:
+            return result
+
+        Task.objects.filter(id__in=result['updated']).update(status=new_status)
+
+        old_statuses = {task.id: task.status for task in changed}
+        TaskHistory.objects.bulk_create([
+            TaskHistory(task=task, actor=user, old_status=task.status, new_status=new_status)
+            for task in changed
+        ], batch_size=settings.BULK_INSERT_BATCH_SIZE)
+
+        deltas = defaultdict(Counter)
+        for task in changed:
+            deltas[task.category_id].subtract(task_counter_values(task.status, task.due_date, today))
+            deltas[task.category_id].update(task_counter_values(new_status, task.due_date, today))
+        apply_category_counter_deltas(deltas)
+
+        queued = queue_bulk_status_change_notifications(changed, old_statuses, new_status)
+        transaction.on_commit(invalidate_task_counts)
+
+    logger.info(
+        f"{user.username} moved {len(changed)} tasks to '{new_status}' "
+        f"({queued} notifications queued, {len(result['not_permitted'])} not permitted)"
+    )
+    return result
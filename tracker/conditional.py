@@ -0,0 +1,93 @@
+# tracker/conditional.py
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .stats import get_rows_removed_at
+
+
+def make_etag(*parts):
+    """Return a quoted ETag derived from ``parts`` (anything with a stable ``repr``)"""
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def latest(*timestamps):
+    """Return the newest of the given datetimes, ignoring None"""
+    timestamps = [value for value in timestamps if value is not None]
+    return max(timestamps) if timestamps else None
+
+
+def not_modified_response(request, etag, last_modified):
+    """
+    Return a 304 (or 412) response if the request's validators still match, else None.
+
+    Args:
+        etag: The quoted ETag of the current representation
+        last_modified: Datetime of the newest change, or None
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified):
+    """
+    Add ETag / Last-Modified headers to a response.
+
+    The responses are per user, so they are marked private and must be
+    revalidated; a revalidation costs one aggregate query when nothing changed.
+    """
+    response.headers['ETag'] = etag
+    if last_modified:
+        response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for a viewset's ``list`` and ``retrieve``.
+
+    Validators come from the model's ``updated_at``: lists use the count
+    and newest timestamp of the rows the user can see (one aggregate
+    query), details the row's own timestamp. When the client already has
+    the current version the view answers ``304 Not Modified`` without
+    loading or serializing anything else.
+    """
+
+    def representation_key(self, request):
+        # The same rows render differently per user (visibility), URL (page,
+        # ordering) and format (JSON or the browsable API)
+        return (request.user.pk, request.get_full_path(), request.accepted_renderer.format)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        summary = queryset.aggregate(count=Count('pk'), newest=Max('updated_at'))
+        etag = make_etag(*self.representation_key(request), summary['count'], summary['newest'])
+        last_modified = latest(summary['newest'], get_rows_removed_at())
+        return self.conditional(request, etag, last_modified, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            updated_at = (
+                self.get_queryset().filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .order_by().values_list('updated_at', flat=True).first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            updated_at = None
+        if updated_at is None:
+            # Not found (or not visible): let the normal path build the 404
+            return super().retrieve(request, *args, **kwargs)
+        etag = make_etag(*self.representation_key(request), updated_at)
+        return self.conditional(request, etag, updated_at, super().retrieve, *args, **kwargs)
+
+    def conditional(self, request, etag, last_modified, view, *args, **kwargs):
+        response = not_modified_response(request, etag, last_modified)
+        if response is None:
+            response = view(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            set_validators(response, etag, last_modified)
+        return response
@@ -0,0 +1,240 @@
+# tracker/dates.py
+import calendar
+import logging
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+logger = logging.getLogger('tracker')
+
+WEEKDAYS = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6
+}
+MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+MONTHS['sept'] = 9
+
+_WEEKDAY = r'(monday|tuesday|wednesday|thursday|friday|saturday|sunday)'
+_MONTH = r'(' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\.?'
+_DAY = r'(\d{1,2})(?:st|nd|rd|th)?'
+
+# Absolute dates, checked first
+ISO_DATE_RE = re.compile(r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b')
+US_DATE_RE = re.compile(r'\b(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})\b')
+MONTH_DAY_RE = re.compile(r'\b' + _MONTH + r'\s+' + _DAY + r'\b(?:,?\s+(\d{4})\b)?', re.I)
+DAY_MONTH_RE = re.compile(r'\b' + _DAY + r'\s+(?:of\s+)?' + _MONTH + r'(?:,?\s+(\d{4})\b)?', re.I)
+# Relative expressions
+DAY_AFTER_TOMORROW_RE = re.compile(r'\bday\s+after\s+tomorrow\b', re.I)
+TOMORROW_RE = re.compile(r'\btomorrow\b', re.I)
+TODAY_RE = re.compile(r'\b(?:today|tonight|eod|end\s+of\s+(?:the\s+)?day)\b', re.I)
+END_OF_MONTH_RE = re.compile(r'\bend\s+of\s+(?:the\s+)?(this|next)?\s*month\b', re.I)
+WEEKDAY_RE = re.compile(
+    r'\b(?:(?:by|on|before|until|due)\s+)?(?:(next|this|coming)\s+)?' + _WEEKDAY + r'\b', re.I
+)
+NEXT_UNIT_RE = re.compile(r'\bnext\s+(week|month)\b', re.I)
+IN_N_UNITS_RE = re.compile(r'\bin\s+(\d+|an?|one|two|three|four)\s+(day|week|month)s?\b', re.I)
+# Words that introduce a due date in free text; "in N days" is its own cue
+DUE_CUE_RE = re.compile(
+    r'\b(?:(?:by|before|until|till|due(?:\s+(?:on|by|date))?|deadline|no\s+later\s+than)\s*:?\s+(?:the\s+)?'
+    r'|(?=in\s+(?:\d+|an?|one|two|three|four)\s+(?:day|week|month)s?\b))',
+    re.I
+)
+
+WORD_NUMBERS = {'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4}
+
+# Parsed (text, today, fallback) results; dates are immutable so sharing them is safe
+PARSE_CACHE_SIZE = 4096
+_fallback_stats = {'calls': 0, 'parsed': 0}
+
+
+def next_weekday(today, weekday):
+    """Return the next date after ``today`` falling on ``weekday`` (0 = Monday)"""
+    days_ahead = weekday - today.weekday()
+    if days_ahead <= 0:  # Target day is today or earlier in the week
+        days_ahead += 7  # So we want next week's occurrence
+    return today + timedelta(days=days_ahead)
+
+
+def add_months(day, months):
+    """Add ``months`` to ``day``, clamping to the last day of the target month"""
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def end_of_month(day):
+    """Return the last day of ``day``'s month"""
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def _safe_date(year, month, day):
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _future_date(today, month, day, year=None):
+    # Without a year, "June 5" means the next June 5 on or after today
+    if year:
+        return _safe_date(int(year), month, day)
+    candidate = _safe_date(today.year, month, day)
+    if candidate and candidate < today:
+        candidate = _safe_date(today.year + 1, month, day)
+    return candidate
+
+
+def _absolute_iso(match, today):
+    return _safe_date(*map(int, match.groups()))
+
+
+def _absolute_us(match, today):
+    month, day, year = map(int, match.groups())
+    if year < 100:
+        year += 2000
+    return _safe_date(year, month, day)
+
+
+def _in_n_units(match, today):
+    amount = match.group(1).lower()
+    amount = int(amount) if amount.isdigit() else WORD_NUMBERS[amount]
+    unit = match.group(2).lower()
+    if unit == 'day':
+        return today + timedelta(days=amount)
+    if unit == 'week':
+        return today + timedelta(weeks=amount)
+    return add_months(today, amount)
+
+
+# (pattern, resolver) in order of precedence: absolute dates, then relative expressions
+DATE_RULES = [
+    (ISO_DATE_RE, _absolute_iso),
+    (US_DATE_RE, _absolute_us),
+    (MONTH_DAY_RE, lambda match, today: _future_date(
+        today, MONTHS[match.group(1).lower()], int(match.group(2)), match.group(3))),
+    (DAY_MONTH_RE, lambda match, today: _future_date(
+        today, MONTHS[match.group(2).lower()], int(match.group(1)), match.group(3))),
+    (DAY_AFTER_TOMORROW_RE, lambda match, today: today + timedelta(days=2)),
+    (TOMORROW_RE, lambda match, today: today + timedelta(days=1)),
+    (TODAY_RE, lambda match, today: today),
+    (END_OF_MONTH_RE, lambda match, today: end_of_month(add_months(
+        today.replace(day=1), 1 if (match.group(1) or '').lower() == 'next' else 0))),
+    (WEEKDAY_RE, lambda match, today: next_weekday(today, WEEKDAYS[match.group(2).lower()])),
+    # "next month" is approximated as 30 days, as it always has been
+    (NEXT_UNIT_RE, lambda match, today: today + timedelta(
+        days=7 if match.group(1).lower() == 'week' else 30)),
+    (IN_N_UNITS_RE, _in_n_units),
+]
+
+
+def _parse_rules(text, today, method='fullmatch'):
+    # 'fullmatch': the text must be exactly one expression; 'match': it must start the text
+    for pattern, resolve in DATE_RULES:
+        match = getattr(pattern, method)(text)
+        parsed = resolve(match, today) if match else None
+        if parsed:
+            return parsed
+    return None
+
+
+def _parse_with_dateparser(text, today):
+    # Importing dateparser costs far more than every rule above, so only pay for it here
+    import dateparser
+
+    logger.debug(f"No date rule matched '{text}', falling back to dateparser")
+    _fallback_stats['calls'] += 1
+    parsed = dateparser.parse(
+        text,
+        settings={
+            'PREFER_DATES_FROM': 'future',
+            'RELATIVE_BASE': datetime.combine(today, datetime.min.time()),
+            'RETURN_AS_TIMEZONE_AWARE': False
+        }
+    )
+    if parsed is None:
+        return None
+    _fallback_stats['parsed'] += 1
+    return parsed.date()
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(text, today, fallback):
+    cue = DUE_CUE_RE.match(text)
+    parsed = _parse_rules(text[cue.end():] if cue else text, today)
+    if parsed is None and fallback:
+        parsed = _parse_with_dateparser(text, today)
+    return parsed
+
+
+def parse_due_date(text, today=None, fallback=True):
+    """
+    Resolve a due date expression to a date.
+
+    Handles the expressions tasks actually use: ISO (2025-06-01) and US
+    (06/01/2025) dates, month names ("by June 5"), "today"/"tomorrow",
+    "end of month", "next Friday", "next week" and "in N days/weeks/months".
+    The whole value must be one expression, optionally introduced by a
+    cue such as "by" or "due" and followed by punctuation, so a date
+    surrounded by other text ("foo 2025-06-01 bar") is rejected; use
+    ``extract_due_date`` for free text. Results are memoized on
+    ``(text, today)``.
+
+    Args:
+        text (str): The expression, e.g. an import value or a model's ``due_date``
+        today (date): Reference date for relative expressions (defaults to today)
+        fallback (bool): Try ``dateparser`` when no rule matches
+
+    Returns:
+        date: The resolved date, or None if nothing could be parsed
+    """
+    if not text:
+        return None
+    return _parse_cached(' '.join(str(text).split()).rstrip('.,;!'), today or date.today(), fallback)
+
+
+def extract_due_date(text, today=None):
+    """
+    Find the due date in free text, looking only at what follows a due date cue.
+
+    Prompts mention other dates ("called today", "happened on Monday",
+    "parked since 3 Sept"), so unlike ``parse_due_date`` the whole text is
+    not searched: a date only counts if it directly follows "by", "due",
+    "before", "until" or "deadline", or is an "in N days/weeks/months"
+    expression. The first cue followed by a date wins. There is no
+    dateparser fallback.
+
+    Args:
+        text (str): The prompt to search
+        today (date): Reference date for relative expressions (defaults to today)
+
+    Returns:
+        date: The due date, or None if no cue is followed by a date
+    """
+    if not text:
+        return None
+    text = ' '.join(str(text).split())
+    today = today or date.today()
+    for cue in DUE_CUE_RE.finditer(text):
+        parsed = _parse_rules(text[cue.end():], today, method='match')
+        if parsed:
+            return parsed
+    return None
+
+
+def get_date_parser_stats():
+    """Return memoization and dateparser fallback counters for this process"""
+    info = _parse_cached.cache_info()
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'cached': info.currsize,
+        'fallback_calls': _fallback_stats['calls'],
+        'fallback_parsed': _fallback_stats['parsed'],
+    }
+
+
+def clear_date_parser_cache():
+    """Drop memoized results (mainly for benchmarks and tests)"""
+    _parse_cached.cache_clear()
+    _fallback_stats.update(calls=0, parsed=0)
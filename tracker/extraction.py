@@ -0,0 +1,150 @@
+# tracker/extraction.py
+import logging
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from itertools import islice
+
+from django.conf import settings
+
+from .dates import extract_due_date
+
+logger = logging.getLogger('tracker')
+
+# Patterns are compiled once at import and shared by every extraction
+FIRST_SENTENCE_RE = re.compile(r'^([^.!?]+[.!?])')
+HIGH_PRIORITY_RE = re.compile(r'\bhigh\s+priority\b|\bpriority\s*:\s*high\b|\bimportant\b|\burgent\b', re.I)
+LOW_PRIORITY_RE = re.compile(r'\blow\s+priority\b|\bpriority\s*:\s*low\b|\bnot\s+urgent\b|\bcan\s+wait\b', re.I)
+# (pattern, suggested category id) in order of precedence; anything else is Initial Survey (1)
+CATEGORY_RULES = [
+    (re.compile(r'\bdamage\s+assessment\b|\bdamage\b|\bassess\b', re.I), 2),  # Damage Assessment
+    (re.compile(r'\bclaims?\b|\bprocessing\b|\binsurance\b|\bclaim\s+processing\b', re.I), 3),  # Claims Processing
+    (re.compile(r'\bfinal\b|\binspection\b|\bfinal\s+inspection\b|\bclose\b', re.I), 4),  # Final Inspection
+]
+VIN_RE = re.compile(r'\b([A-HJ-NPR-Z0-9]{17})\b')  # Standard VIN format
+ASSIGNEE_RE = re.compile(r'(?:assign(?:ed)?\s+to|for)\s+([A-Z][a-z]+)')
+
+
+def extract_task_details(prompt, today=None):
+    """
+    Extract task details from a prompt with the precompiled rules.
+
+    Args:
+        prompt (str): The user's text prompt describing the task
+        today (date): The reference date for relative due dates (defaults to today)
+
+    Returns:
+        dict: ``title``, ``description``, ``priority``, ``category_id``,
+        ``due_date`` (YYYY-MM-DD) and, if mentioned, ``assigned_to``
+    """
+    today = today or date.today()
+    task_data = {
+        'title': 'New Task',
+        'description': prompt,
+        'priority': 'Medium',
+        'category_id': 1,  # Default to Initial Survey
+        'due_date': None,
+    }
+
+    # Title: first sentence, or the first 50 chars
+    first_sentence_match = FIRST_SENTENCE_RE.match(prompt)
+    if first_sentence_match:
+        task_data['title'] = first_sentence_match.group(1).strip()
+    else:
+        task_data['title'] = prompt[:50] + ('...' if len(prompt) > 50 else '')
+
+    if HIGH_PRIORITY_RE.search(prompt):
+        task_data['priority'] = 'High'
+    elif LOW_PRIORITY_RE.search(prompt):
+        task_data['priority'] = 'Low'
+
+    for pattern, category_id in CATEGORY_RULES:
+        if pattern.search(prompt):
+            task_data['category_id'] = category_id
+            break
+
+    vin_match = VIN_RE.search(prompt)
+    if vin_match:
+        task_data['description'] = f"VIN: {vin_match.group(1)}\n\n{task_data['description']}"
+        if 'VIN' not in task_data['title']:
+            task_data['title'] = f"Survey for VIN {vin_match.group(1)[:8]}"
+
+    assign_match = ASSIGNEE_RE.search(prompt)
+    if assign_match:
+        task_data['assigned_to'] = assign_match.group(1)
+
+    # Only dates after a cue ("by Friday", "in 3 days") are due dates; others describe the job
+    due_date = extract_due_date(prompt, today) or today + timedelta(days=7)
+    task_data['due_date'] = due_date.strftime('%Y-%m-%d')
+    return task_data
+
+
+def _extract_batch(prompts, today):
+    # Runs in pool workers; one call per batch keeps pickling overhead low
+    return [extract_task_details(prompt, today) for prompt in prompts]
+
+
+def iter_batches(iterable, size):
+    """Yield lists of up to ``size`` items from ``iterable`` without reading ahead further"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def extract_many(prompts, today=None, workers=None, batch_size=None):
+    """
+    Extract task details from many prompts, yielding results in input order.
+
+    Prompts are read lazily in batches, so any iterable (a file, a CSV
+    reader, a generator over emails) can be processed without loading it
+    all. With ``workers`` > 1 batches are spread across a process pool,
+    with up to ``workers`` batches in flight at a time.
+
+    Args:
+        prompts: Iterable of prompt strings
+        today (date): Reference date for relative due dates (defaults to today)
+        workers (int): Worker processes (defaults to ``EXTRACTION_WORKERS``; 1 runs inline)
+        batch_size (int): Prompts per batch (defaults to ``EXTRACTION_BATCH_SIZE``)
+
+    Yields:
+        dict: The extracted details for each prompt
+    """
+    today = today or date.today()
+    workers = workers or settings.EXTRACTION_WORKERS
+    batch_size = batch_size or settings.EXTRACTION_BATCH_SIZE
+    batches = iter_batches(prompts, batch_size)
+
+    if workers <= 1:
+        for batch in batches:
+            yield from _extract_batch(batch, today)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a bounded window of batches in flight so memory stays flat
+        pending = [pool.submit(_extract_batch, batch, today) for batch in islice(batches, workers)]
+        while pending:
+            results = pending.pop(0).result()
+            for batch in islice(batches, 1):
+                pending.append(pool.submit(_extract_batch, batch, today))
+            yield from results
+
+
+def measure_extraction(prompts, workers=1, batch_size=None, today=None):
+    """
+    Run ``extract_many`` over ``prompts`` and report its throughput.
+
+    Returns:
+        dict: ``count``, ``seconds`` and ``prompts_per_second``
+    """
+    started = time.perf_counter()
+    count = sum(1 for _ in extract_many(prompts, today=today, workers=workers, batch_size=batch_size))
+    seconds = time.perf_counter() - started
+    return {
+        'count': count,
+        'seconds': round(seconds, 4),
+        'prompts_per_second': round(count / seconds) if seconds else None,
+    }
@@ -0,0 +1,176 @@
+# tracker/extraction_cache.py
+import copy
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ExtractionCacheEntry
+
+logger = logging.getLogger('tracker')
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_prompt(prompt):
+    """Fold case and whitespace so trivially different prompts share a cache entry"""
+    return WHITESPACE_RE.sub(' ', prompt).strip().casefold()
+
+
+def extraction_cache_key(prompt, model_name, reference_date):
+    """Return the cache key for a prompt, model and reference date"""
+    raw = f"{model_name}\n{reference_date.isoformat()}\n{normalize_prompt(prompt)}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Two-tier cache for AI extraction results.
+
+    Lookups check a per-process LRU first and then the ``ExtractionCacheEntry``
+    table, which is shared by every worker. Entries expire after
+    ``EXTRACTION_CACHE_TTL_SECONDS``; ``evict()`` trims the table to the
+    ``EXTRACTION_CACHE_MAX_ENTRIES`` most recently used rows and is run
+    periodically by the AI job worker rather than on every write.
+
+    Memory hits are written through to the row's ``hits`` and
+    ``last_used_at`` at most once per ``EXTRACTION_CACHE_TOUCH_SECONDS``,
+    so prompts served from memory still count as recently used.
+    """
+
+    def __init__(self, memory_size=None):
+        self.memory_size = memory_size or settings.EXTRACTION_CACHE_MEMORY_SIZE
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+    def _remember(self, key, result, expires_at, touched_at):
+        # Memory entries are [result, expires_at, last write-through time, hits since then]
+        with self._lock:
+            self._memory[key] = [result, expires_at, touched_at, 0]
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, prompt, model_name, reference_date):
+        """
+        Return a copy of the cached result for a prompt, or None on a miss.
+
+        Args:
+            prompt: The raw user prompt
+            model_name: The model that produced the result
+            reference_date: The date relative due dates were resolved against
+        """
+        key = extraction_cache_key(prompt, model_name, reference_date)
+        ttl = settings.EXTRACTION_CACHE_TTL_SECONDS
+
+        touch = None
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and cached[1] > time.time():
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                cached[3] += 1
+                if time.time() - cached[2] >= settings.EXTRACTION_CACHE_TOUCH_SECONDS:
+                    touch, cached[2], cached[3] = cached[3], time.time(), 0
+                result = copy.deepcopy(cached[0])
+            else:
+                self._memory.pop(key, None)
+                cached = None
+
+        now = timezone.now()
+        if cached:
+            if touch:
+                ExtractionCacheEntry.objects.filter(key=key).update(hits=F('hits') + touch, last_used_at=now)
+            return result
+
+        entry = (
+            ExtractionCacheEntry.objects
+            .filter(key=key, created_at__gt=now - timedelta(seconds=ttl))
+            .only('result', 'created_at')
+            .first()
+        )
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        ExtractionCacheEntry.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=now)
+        self._remember(key, entry.result, entry.created_at.timestamp() + ttl, now.timestamp())
+        self.stats['db_hits'] += 1
+        return copy.deepcopy(entry.result)
+
+    def set(self, prompt, model_name, reference_date, result):
+        """Store a result in both tiers"""
+        key = extraction_cache_key(prompt, model_name, reference_date)
+        now = timezone.now()
+        result = copy.deepcopy(result)
+        try:
+            with transaction.atomic():
+                ExtractionCacheEntry.objects.update_or_create(
+                    key=key,
+                    defaults={
+                        'model_name': model_name,
+                        'reference_date': reference_date,
+                        'prompt': normalize_prompt(prompt),
+                        'result': result,
+                        'created_at': now,
+                        'last_used_at': now,
+                    },
+                )
+        except IntegrityError:
+            # Another worker stored the same prompt at the same moment
+            pass
+        self._remember(key, result, now.timestamp() + settings.EXTRACTION_CACHE_TTL_SECONDS, now.timestamp())
+        self.stats['writes'] += 1
+
+    def evict(self, now=None):
+        """
+        Delete expired rows and the least recently used rows over the size limit.
+
+        Returns:
+            int: The number of rows deleted
+        """
+        now = now or timezone.now()
+        expired, _ = ExtractionCacheEntry.objects.filter(
+            created_at__lte=now - timedelta(seconds=settings.EXTRACTION_CACHE_TTL_SECONDS)
+        ).delete()
+        excess = ExtractionCacheEntry.objects.count() - settings.EXTRACTION_CACHE_MAX_ENTRIES
+        evicted = 0
+        if excess > 0:
+            # Delete by id so this works on databases without DELETE ... LIMIT
+            oldest = list(ExtractionCacheEntry.objects.order_by('last_used_at', 'id').values_list('id', flat=True)[:excess])
+            evicted, _ = ExtractionCacheEntry.objects.filter(id__in=oldest).delete()
+        if expired or evicted:
+            logger.info(f"Extraction cache evicted {expired} expired and {evicted} least recently used entries")
+        self.stats['evictions'] += expired + evicted
+        return expired + evicted
+
+    def clear(self):
+        """Empty the in-memory tier (the table is left alone)"""
+        with self._lock:
+            self._memory.clear()
+
+
+extraction_cache = ExtractionCache()
+
+
+def get_extraction_cache_stats():
+    """
+    Return this process's extraction cache counters.
+
+    Returns:
+        dict: ``memory_hits``, ``db_hits``, ``misses``, ``writes``,
+        ``evictions`` and the overall ``hit_rate`` (0-1)
+    """
+    stats = dict(extraction_cache.stats)
+    lookups = stats['memory_hits'] + stats['db_hits'] + stats['misses']
+    stats['hit_rate'] = (stats['memory_hits'] + stats['db_hits']) / lookups if lookups else 0.0
+    return stats
@@ -0,0 +1,22 @@
+# tracker/filters.py
+from rest_framework.filters import OrderingFilter
+
+
+class TaskOrderingFilter(OrderingFilter):
+    """
+    Ordering filter for tasks that sorts ``?ordering=priority`` by the stored
+    integer ``priority_rank`` (Low < Medium < High) instead of the label text.
+    """
+    ordering_fields = ['due_date', 'priority', 'status', 'title', 'id']
+    field_aliases = {'priority': 'priority_rank'}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        aliased = []
+        for field in ordering:
+            descending = field.startswith('-')
+            name = self.field_aliases.get(field.lstrip('-'), field.lstrip('-'))
+            aliased.append(('-' if descending else '') + name)
+        return aliased
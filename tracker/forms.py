@@ -1,6 +1,7 @@
 # tracker/forms.py
 from django import forms
-from .models import Task, PRIORITY_CHOICES
+from django.conf import settings
+from .models import Task, PRIORITY_CHOICES, STATUS_CHOICES
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from .models import Profile
@@ -122,6 +123,13 @@ class AITaskForm(forms.Form):
         }),
         help_text="Upload an audio file to transcribe instead of typing (optional)"
     )
+    
+    def clean_audio_file(self):
+        audio_file = self.cleaned_data.get('audio_file')
+        if audio_file and audio_file.size > settings.AUDIO_MAX_UPLOAD_BYTES:
+            limit_mb = settings.AUDIO_MAX_UPLOAD_BYTES // (1024 * 1024)
+            raise forms.ValidationError(f"Audio file must be {limit_mb} MB or smaller.")
+        return audio_file
 
 class CustomUserCreationForm(UserCreationForm):
     phone_number = forms.CharField(
@@ -163,3 +171,24 @@ class CustomUserCreationForm(UserCreationForm):
             profile.phone_number = phone
             profile.save()
         return user
+
+class TaskIdsField(forms.MultipleChoiceField):
+    """A list of task ids submitted as repeated ``task_ids`` values"""
+
+    def to_python(self, value):
+        try:
+            return [int(task_id) for task_id in super().to_python(value)]
+        except ValueError:
+            raise forms.ValidationError("Enter valid task ids")
+
+    def validate(self, value):
+        # Any id is accepted here; permissions are checked when the tasks are updated
+        if self.required and not value:
+            raise forms.ValidationError(self.error_messages['required'], code='required')
+        if len(value) > settings.BULK_STATUS_MAX_TASKS:
+            raise forms.ValidationError(f"Select at most {settings.BULK_STATUS_MAX_TASKS} tasks")
+
+class BulkStatusForm(forms.Form):
+    """The dashboard's bulk action: tasks to update and the status to apply"""
+    task_ids = TaskIdsField()
+    status = forms.ChoiceField(choices=STATUS_CHOICES)
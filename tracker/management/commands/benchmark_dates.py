@@ -0,0 +1,76 @@
+# tracker/management/commands/benchmark_dates.py
+import time
+from datetime import date, datetime
+from itertools import cycle, islice
+
+from django.core.management.base import BaseCommand
+
+from tracker.dates import clear_date_parser_cache, get_date_parser_stats, parse_due_date
+
+SAMPLE_EXPRESSIONS = [
+    'next Monday',
+    'by next friday',
+    'in 3 days',
+    'in a week',
+    'in 2 weeks',
+    'next week',
+    'tomorrow',
+    'end of month',
+    '2025-06-01',
+    '06/15/2025',
+    'by June 5',
+    '5th of July',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the rule-based due date parser (cold and memoized) with "
+        "dateparser over typical due date expressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=5000,
+            help="Number of expressions to parse per run (samples are repeated)",
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        today = date.today()
+
+        clear_date_parser_cache()
+        started = time.perf_counter()
+        for text in SAMPLE_EXPRESSIONS:
+            parse_due_date(text, today, fallback=False)
+        cold = (time.perf_counter() - started) / len(SAMPLE_EXPRESSIONS)
+
+        started = time.perf_counter()
+        for text in islice(cycle(SAMPLE_EXPRESSIONS), count):
+            parse_due_date(text, today, fallback=False)
+        warm = (time.perf_counter() - started) / count
+
+        self.stdout.write(f"rules (uncached): {cold * 1e6:.1f} µs/expression")
+        self.stdout.write(f"rules (memoized): {warm * 1e6:.1f} µs/expression")
+        self.stdout.write(f"cache: {get_date_parser_stats()}")
+
+        started = time.perf_counter()
+        import dateparser
+        self.stdout.write(f"dateparser import: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        base = datetime.combine(today, datetime.min.time())
+        parser_settings = {'PREFER_DATES_FROM': 'future', 'RELATIVE_BASE': base}
+        runs = min(count, 500)
+        started = time.perf_counter()
+        unparsed = 0
+        for text in islice(cycle(SAMPLE_EXPRESSIONS), runs):
+            if dateparser.parse(text, settings=parser_settings) is None:
+                unparsed += 1
+        slow = (time.perf_counter() - started) / runs
+        self.stdout.write(
+            f"dateparser: {slow * 1e6:.1f} µs/expression over {runs} runs "
+            f"({unparsed} unparsed)"
+        )
+        self.stdout.write(f"speedup: {slow / cold:.0f}x uncached, {slow / warm:.0f}x memoized")
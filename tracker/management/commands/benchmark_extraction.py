@@ -0,0 +1,65 @@
+# tracker/management/commands/benchmark_extraction.py
+import re
+from itertools import cycle, islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.extraction import measure_extraction
+
+PROMPT_BLOCK_RE = re.compile(r'\*\*Prompt:\*\*\s*```\s*(.+?)\s*```', re.S)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure rule-based extraction throughput (prompts per second) over the "
+        "prompts in example_prompts.md, inline and across process pools."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=20000,
+            help="Number of prompts to extract per run (example prompts are repeated)",
+        )
+        parser.add_argument(
+            '--workers',
+            default='1,2,4',
+            help="Comma-separated worker process counts to compare",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EXTRACTION_BATCH_SIZE,
+            help="Prompts per batch",
+        )
+        parser.add_argument(
+            '--prompts-file',
+            default=str(Path(settings.BASE_DIR) / 'example_prompts.md'),
+            help="Markdown file with **Prompt:** code blocks to sample from",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            text = Path(options['prompts_file']).read_text()
+        except OSError as e:
+            raise CommandError(f"Cannot read prompts file: {e}")
+        samples = PROMPT_BLOCK_RE.findall(text)
+        if not samples:
+            raise CommandError("No prompts found in the prompts file")
+
+        try:
+            worker_counts = [int(value) for value in options['workers'].split(',')]
+        except ValueError:
+            raise CommandError("--workers must be a comma-separated list of integers")
+
+        self.stdout.write(f"Extracting {options['count']} prompts ({len(samples)} distinct samples)")
+        for workers in worker_counts:
+            prompts = islice(cycle(samples), options['count'])
+            result = measure_extraction(prompts, workers=workers, batch_size=options['batch_size'])
+            self.stdout.write(
+                f"workers={workers}: {result['count']} prompts in {result['seconds']:.3f}s "
+                f"({result['prompts_per_second']} prompts/s)"
+            )
@@ -0,0 +1,124 @@
+# tracker/management/commands/benchmark_imports.py
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Third-party integrations that should only be loaded when first used
+LAZY_MODULES = ['twilio', 'dateparser', 'requests', 'whisper', 'numpy']
+
+SETUP = "import django; django.setup(); "
+TARGETS = {
+    # Django is set up first so only what tracker.views adds on top is counted
+    'tracker.views': SETUP + "import tracker.views",
+    'task_tracker_pro.wsgi': "import task_tracker_pro.wsgi",
+}
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(output):
+    """
+    Parse ``python -X importtime`` output.
+
+    Returns:
+        list: ``(module, self_us, cumulative_us, depth)`` tuples in report order
+    """
+    rows = []
+    for line in output.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def importer_of(rows, index):
+    # -X importtime prints children before their parent, one level deeper
+    depth = rows[index][3]
+    for module, _, _, row_depth in rows[index + 1:]:
+        if row_depth < depth:
+            return module
+    return None
+
+
+def subtree(rows, index):
+    """Return ``rows[index]`` and every import it triggered"""
+    depth = rows[index][3]
+    start = index
+    while start > 0 and rows[start - 1][3] > depth:
+        start -= 1
+    return rows[start:index + 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Report import time (python -X importtime) of tracker.views and the WSGI "
+        "application in fresh interpreters, and which heavy integrations get loaded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help="Fresh interpreters to start per target; the median is reported",
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help="Number of slowest modules (by self time) to list",
+        )
+        parser.add_argument(
+            '--target',
+            choices=sorted(TARGETS),
+            action='append',
+            help="Only measure this target (may be repeated)",
+        )
+
+    def run_target(self, code):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            'DJANGO_SETTINGS_MODULE', 'task_tracker_pro.settings'))
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Import failed:\n{result.stderr[-2000:]}")
+        return parse_importtime(result.stderr)
+
+    def handle(self, *args, **options):
+        for target in options['target'] or sorted(TARGETS):
+            runs = [self.run_target(TARGETS[target]) for _ in range(max(options['repeat'], 1))]
+            totals = [
+                next(cumulative for module, _, cumulative, _ in rows if module == target)
+                for rows in runs
+            ]
+            self.stdout.write(
+                f"{target}: median {statistics.median(totals) / 1000:.1f} ms "
+                f"(min {min(totals) / 1000:.1f} ms over {len(totals)} runs)"
+            )
+
+            rows = runs[-1]
+            index = next(i for i, row in enumerate(rows) if row[0] == target)
+            slowest = sorted(subtree(rows, index), key=lambda row: row[1], reverse=True)[:options['top']]
+            for module, self_us, cumulative_us, _ in slowest:
+                self.stdout.write(f"  {self_us / 1000:7.1f} ms self {cumulative_us / 1000:7.1f} ms total  {module}")
+
+            for name in LAZY_MODULES:
+                index = next((i for i, row in enumerate(rows) if row[0] == name), None)
+                if index is None:
+                    self.stdout.write(f"  {name}: not imported")
+                else:
+                    self.stdout.write(
+                        f"  {name}: imported by {importer_of(rows, index) or '<top level>'} "
+                        f"({rows[index][2] / 1000:.1f} ms)"
+                    )
@@ -0,0 +1,93 @@
+# tracker/management/commands/explain_task_queries.py
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tracker.models import Task, Category
+from tracker.pagination import paginate_keyset
+from tracker.stats import get_task_stats, pending_counts_query
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the database EXPLAIN plans for the main task queries issued by the "
+        "dashboard, gallery views and API, to check which indexes they use."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help="Username whose role-scoped queries should be explained (defaults to the first user)",
+        )
+        parser.add_argument(
+            '--category',
+            type=int,
+            help="Category id used for the per-category gallery query (defaults to the first category)",
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help="Run EXPLAIN ANALYZE to include actual timings (PostgreSQL only)",
+        )
+
+    def handle(self, *args, **options):
+        if options['analyze'] and connection.vendor != 'postgresql':
+            raise CommandError("--analyze is only supported on PostgreSQL")
+
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+        else:
+            user = User.objects.order_by('id').first()
+            if user is None:
+                raise CommandError("No users found; create one or pass --user")
+
+        category_id = options['category'] or Category.objects.order_by('id').values_list('id', flat=True).first()
+
+        first_page = paginate_keyset(Task.objects.visible_to(user))
+        queries = [("Task list, first page", lambda: paginate_keyset(Task.objects.visible_to(user)))]
+        if first_page.has_next:
+            queries.append(("Task list, next page (keyset)", lambda: paginate_keyset(
+                Task.objects.visible_to(user), cursor=first_page.next_cursor)))
+        queries += [
+            ("Dashboard statistics", lambda: get_task_stats(user)),
+            # Run the query itself: the cached helper may answer without touching the database
+            ("Pending counts per category", lambda: list(pending_counts_query(user))),
+            ("Tasks in one category", lambda: list(
+                Task.objects.visible_to(user).filter(category_id=category_id))),
+        ]
+
+        self.stdout.write(
+            f"Database: {connection.vendor}; user: {user.username}; category: {category_id}\n"
+        )
+        for title, run in queries:
+            with CaptureQueriesContext(connection) as ctx:
+                run()
+            for query in ctx.captured_queries:
+                # The role lookup is a primary-key read; only show task queries
+                if 'tracker_task' not in query['sql']:
+                    continue
+                self.stdout.write(self.style.MIGRATE_HEADING(title))
+                self.stdout.write(query['sql'])
+                self.stdout.write(self._explain(query['sql'], options['analyze']))
+                self.stdout.write('')
+
+    def _explain(self, sql, analyze):
+        """Run EXPLAIN for an already-rendered SQL statement and format the plan"""
+        prefix = connection.ops.explain_query_prefix(analyze=analyze) if analyze else connection.ops.explain_query_prefix()
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}")
+            rows = cursor.fetchall()
+
+        if connection.vendor == 'sqlite':
+            # EXPLAIN QUERY PLAN rows are (id, parent, notused, detail)
+            depth = {0: 0}
+            lines = []
+            for node_id, parent, _notused, detail in rows:
+                depth[node_id] = depth.get(parent, 0) + 1
+                lines.append('  ' * depth[node_id] + detail)
+            return '\n'.join(lines)
+        return '\n'.join(' '.join(str(column) for column in row) for row in rows)
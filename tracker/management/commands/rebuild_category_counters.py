@@ -0,0 +1,40 @@
+# tracker/management/commands/rebuild_category_counters.py
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from tracker.stats import rebuild_category_counters
+
+
+def seconds_until_tomorrow(now=None):
+    """Return the seconds left until the next local midnight"""
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (midnight - now).total_seconds()
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the denormalized task counters (total, open, approved, overdue) "
+        "on every Category. Run daily so overdue counts stay current: from cron, or "
+        "as a long-running process with --daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--daily',
+            action='store_true',
+            help="Keep running and rebuild now and again just after every midnight",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                changed = rebuild_category_counters()
+                self.stdout.write(self.style.SUCCESS(f"Updated counters for {changed} categories"))
+                if not options['daily']:
+                    break
+                time.sleep(seconds_until_tomorrow() + 60)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,81 @@
+# tracker/management/commands/run_ai_jobs.py
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tracker.ai_jobs import claim_ai_jobs, fail_stuck_jobs, run_ai_job_in_thread
+from tracker.extraction_cache import extraction_cache
+from tracker.transcription import get_transcription_stats, warm_up_whisper
+
+
+class Command(BaseCommand):
+    help = (
+        "Process queued AI task creation jobs (transcription, extraction and task creation) "
+        "with bounded concurrency. Runs until interrupted unless --once is given, trimming "
+        "the extraction cache every EXTRACTION_CACHE_EVICT_SECONDS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Process every job that is currently queued, then exit",
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.AI_JOB_CONCURRENCY,
+            help="Maximum number of jobs processed at the same time",
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.AI_JOB_POLL_SECONDS,
+            help="Seconds to wait before checking again when no job is queued",
+        )
+
+    def handle(self, *args, **options):
+        if settings.WHISPER_PRELOAD and warm_up_whisper():
+            self.stdout.write(f"Whisper model '{settings.WHISPER_MODEL}' loaded")
+
+        concurrency = max(options['concurrency'], 1)
+        finished = failed = 0
+        running = set()
+        evicted_at = 0
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='ai-job') as executor:
+            try:
+                while True:
+                    if time.monotonic() - evicted_at >= settings.EXTRACTION_CACHE_EVICT_SECONDS:
+                        evicted_at = time.monotonic()
+                        extraction_cache.evict()
+                    stuck = fail_stuck_jobs()
+                    if stuck:
+                        self.stderr.write(f"Marked {stuck} stuck jobs as failed")
+                    # Only claim as many jobs as there are free workers, so queued
+                    # jobs stay available to other worker processes
+                    for job in claim_ai_jobs(concurrency - len(running)):
+                        running.add(executor.submit(run_ai_job_in_thread, job))
+
+                    if not running:
+                        if options['once']:
+                            break
+                        time.sleep(options['poll_interval'])
+                        continue
+
+                    done, running = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job = future.result()
+                        finished += 1
+                        failed += job.status == 'failed'
+            except KeyboardInterrupt:
+                pass
+        self.stdout.write(self.style.SUCCESS(f"Processed {finished} AI task jobs ({failed} failed)"))
+        stats = get_transcription_stats()
+        if stats['model_loads'] or stats['transcriptions'] or stats['failures']:
+            self.stdout.write(
+                f"Whisper: {stats['model_loads']} model loads in {stats['load_seconds']:.1f}s; "
+                f"{stats['transcriptions']} transcriptions, {stats['failures']} failed, "
+                f"avg {stats['avg_inference_seconds']}s inference"
+            )
@@ -0,0 +1,56 @@
+# tracker/management/commands/send_notifications.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tracker.notifications import process_outbox_batch
+from tracker.utils import get_twilio_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued WhatsApp notifications from the outbox in batches, retrying "
+        "failures with exponential backoff. Runs until interrupted unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Send every message that is currently due, then exit",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.NOTIFICATION_BATCH_SIZE,
+            help="Maximum number of messages claimed per batch",
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.NOTIFICATION_POLL_SECONDS,
+            help="Seconds to wait before checking again when the outbox is empty",
+        )
+
+    def handle(self, *args, **options):
+        total_attempted = total_sent = 0
+        try:
+            while True:
+                attempted, sent = process_outbox_batch(options['batch_size'])
+                total_attempted += attempted
+                total_sent += sent
+                if attempted:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Sent {total_sent} of {total_attempted} notification attempts"))
+        stats = get_twilio_stats()
+        self.stdout.write(
+            f"Twilio: {stats['sends']} sent, {stats['failures']} failed, "
+            f"avg {stats['avg_latency_ms']} ms; {stats['requests']} requests over "
+            f"{stats['connections_opened']} connections"
+        )
@@ -0,0 +1,113 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tracker', '0004_alter_profile_phone_number'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='category',
+            options={'verbose_name': 'Category', 'verbose_name_plural': 'Categories'},
+        ),
+        migrations.AlterModelOptions(
+            name='profile',
+            options={'verbose_name': 'User Profile', 'verbose_name_plural': 'User Profiles'},
+        ),
+        migrations.AlterModelOptions(
+            name='role',
+            options={'verbose_name': 'User Role', 'verbose_name_plural': 'User Roles'},
+        ),
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['-due_date', 'priority'], 'verbose_name': 'Task', 'verbose_name_plural': 'Tasks'},
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='phone_number',
+            field=models.CharField(blank=True, help_text='Phone number for WhatsApp notifications (include country code, e.g., +1234567890)', max_length=21),
+        ),
+        migrations.AlterField(
+            model_name='role',
+            name='role_type',
+            field=models.CharField(choices=[('Owner', 'Owner'), ('Team Leader', 'Team Leader'), ('Team Member', 'Team Member')], help_text='Type of role determining user permissions', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='role',
+            name='user',
+            field=models.OneToOneField(help_text='The user this role is assigned to', on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='assigned_by',
+            field=models.ForeignKey(help_text='User who assigned this task', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='assigned_to',
+            field=models.ManyToManyField(help_text='Users responsible for completing this task', related_name='tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='attachments',
+            field=models.FileField(blank=True, help_text='Files related to this task', null=True, upload_to='attachments/'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='category',
+            field=models.ForeignKey(help_text='The category this task belongs to', on_delete=django.db.models.deletion.CASCADE, to='tracker.category'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='comments',
+            field=models.TextField(blank=True, help_text='Additional notes or comments about the task'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='created_by',
+            field=models.ForeignKey(help_text='User who created this task', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='due_date',
+            field=models.DateField(help_text='Date when this task should be completed'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='history_log',
+            field=models.TextField(blank=True, help_text='Chronological record of changes to this task'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='priority',
+            field=models.CharField(choices=[('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High')], help_text='Task priority level', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=models.CharField(choices=[('Not Started', 'Not Started'), ('In Progress', 'In Progress'), ('Submitted for Approval', 'Submitted for Approval'), ('Approved', 'Approved'), ('Reassigned', 'Reassigned')], help_text='Current status of the task', max_length=25),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-due_date', 'priority', 'id'], name='task_due_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['category', 'status'], name='task_category_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_by', 'due_date'], name='task_assigned_by_due_idx'),
+        ),
+    ]
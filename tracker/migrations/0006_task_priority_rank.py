@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:06
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+# Frozen copy of tracker.models.PRIORITY_RANKS at the time of this migration
+PRIORITY_RANKS = {'Low': 1, 'Medium': 2, 'High': 3}
+
+
+def populate_priority_rank(apps, schema_editor):
+    """Fill priority_rank for existing tasks with a single UPDATE"""
+    Task = apps.get_model('tracker', 'Task')
+    Task.objects.update(priority_rank=Case(
+        *[When(priority=priority, then=Value(rank)) for priority, rank in PRIORITY_RANKS.items()],
+        default=Value(0),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0005_task_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['-due_date', '-priority_rank', 'id'], 'verbose_name': 'Task', 'verbose_name_plural': 'Tasks'},
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_due_priority_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='priority_rank',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Numeric priority (higher is more urgent), kept in sync with priority for sorting'),
+        ),
+        migrations.RunPython(populate_priority_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-due_date', '-priority_rank', 'id'], name='task_due_rank_idx'),
+        ),
+    ]
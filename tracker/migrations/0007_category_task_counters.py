@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:07
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_category_counters(apps, schema_editor):
+    """Compute the initial task counters for every category"""
+    Category = apps.get_model('tracker', 'Category')
+    today = datetime.date.today()
+    categories = list(Category.objects.annotate(
+        task_total=Count('task'),
+        task_open=Count('task', filter=~Q(task__status='Approved')),
+        task_approved=Count('task', filter=Q(task__status='Approved')),
+        task_overdue=Count('task', filter=Q(task__due_date__lt=today)),
+    ))
+    for category in categories:
+        category.total_tasks = category.task_total
+        category.open_tasks = category.task_open
+        category.approved_tasks = category.task_approved
+        category.overdue_tasks = category.task_overdue
+    Category.objects.bulk_update(
+        categories, ['total_tasks', 'open_tasks', 'approved_tasks', 'overdue_tasks'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_task_priority_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='approved_tasks',
+            field=models.IntegerField(default=0, editable=False, help_text='Number of approved tasks'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='open_tasks',
+            field=models.IntegerField(default=0, editable=False, help_text='Number of tasks not yet approved'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='overdue_tasks',
+            field=models.IntegerField(default=0, editable=False, help_text='Number of tasks past their due date'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='total_tasks',
+            field=models.IntegerField(default=0, editable=False, help_text='Number of tasks in this category'),
+        ),
+        migrations.RunPython(populate_category_counters, migrations.RunPython.noop),
+    ]
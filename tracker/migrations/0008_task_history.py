@@ -0,0 +1,95 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:09
+
+import datetime
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+# Lines written by notify_assigned_users_on_status_change, e.g.
+# "2025-04-26: Status changed from 'Not Started' to 'In Progress'"
+HISTORY_LINE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2}): Status changed from '(.*)' to '(.*)'$")
+BATCH_SIZE = 1000
+
+
+def copy_history_log_to_rows(apps, schema_editor):
+    """Parse each task's history_log text into TaskHistory rows, inserted in bulk"""
+    Task = apps.get_model('tracker', 'Task')
+    TaskHistory = apps.get_model('tracker', 'TaskHistory')
+
+    batch = []
+    logs = Task.objects.exclude(history_log='').values_list('id', 'history_log')
+    for task_id, history_log in logs.iterator(chunk_size=BATCH_SIZE):
+        for line in history_log.splitlines():
+            match = HISTORY_LINE_RE.match(line.strip())
+            if not match:
+                continue
+            day, old_status, new_status = match.groups()
+            created_at = datetime.datetime.combine(
+                datetime.date.fromisoformat(day), datetime.time.min, tzinfo=datetime.timezone.utc
+            )
+            batch.append(TaskHistory(
+                task_id=task_id,
+                old_status=old_status[:25],
+                new_status=new_status[:25],
+                created_at=created_at,
+            ))
+            if len(batch) >= BATCH_SIZE:
+                TaskHistory.objects.bulk_create(batch)
+                batch = []
+    if batch:
+        TaskHistory.objects.bulk_create(batch)
+
+
+def copy_rows_to_history_log(apps, schema_editor):
+    """Rebuild the history_log text from TaskHistory rows when unapplying"""
+    Task = apps.get_model('tracker', 'Task')
+    TaskHistory = apps.get_model('tracker', 'TaskHistory')
+
+    logs = {}
+    entries = TaskHistory.objects.order_by('task_id', 'created_at', 'id').values_list(
+        'task_id', 'created_at', 'old_status', 'new_status'
+    )
+    for task_id, created_at, old_status, new_status in entries.iterator(chunk_size=BATCH_SIZE):
+        logs.setdefault(task_id, []).append(
+            f"{created_at:%Y-%m-%d}: Status changed from '{old_status}' to '{new_status}'\n"
+        )
+    tasks = list(Task.objects.filter(id__in=logs))
+    for task in tasks:
+        task.history_log = ''.join(logs[task.id])
+    Task.objects.bulk_update(tasks, ['history_log'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tracker', '0007_category_task_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('old_status', models.CharField(blank=True, help_text='Status before the change', max_length=25)),
+                ('new_status', models.CharField(help_text='Status after the change', max_length=25)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, help_text='When the change happened')),
+                ('actor', models.ForeignKey(blank=True, help_text='User who made the change', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='task_history', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(help_text='The task that changed', on_delete=django.db.models.deletion.CASCADE, related_name='history', to='tracker.task')),
+            ],
+            options={
+                'verbose_name': 'Task History Entry',
+                'verbose_name_plural': 'Task History',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['task', '-created_at', '-id'], name='taskhistory_task_created_idx')],
+            },
+        ),
+        migrations.RunPython(copy_history_log_to_rows, copy_rows_to_history_log),
+        migrations.RemoveField(
+            model_name='task',
+            name='history_log',
+        ),
+    ]
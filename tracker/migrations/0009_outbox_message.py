@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tracker', '0008_task_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('to_number', models.CharField(help_text='Phone number to send to (with country code)', max_length=21)),
+                ('body', models.TextField(help_text='Message text')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', help_text='Delivery state of the message', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Number of delivery attempts so far')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the sender may (re)try this message')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('provider_id', models.CharField(blank=True, help_text='Twilio message SID once sent', max_length=64)),
+                ('last_error', models.TextField(blank=True)),
+                ('recipient', models.ForeignKey(help_text='User the message is for', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='outbox_messages', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(blank=True, help_text='Task the message is about', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='outbox_messages', to='tracker.task')),
+            ],
+            options={
+                'verbose_name': 'Outbox Message',
+                'verbose_name_plural': 'Outbox Messages',
+                'ordering': ['next_attempt_at', 'id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_next_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_outbox_message'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='new_status',
+            field=models.CharField(blank=True, help_text='Task status after the change (used to build digests)', max_length=25),
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='old_status',
+            field=models.CharField(blank=True, help_text='Task status before the change (used to build digests)', max_length=25),
+        ),
+    ]
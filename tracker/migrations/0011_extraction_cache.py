@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:18
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0010_outbox_digest_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtractionCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='SHA-256 of the normalized prompt, model and reference date', max_length=64, unique=True)),
+                ('model_name', models.CharField(max_length=100)),
+                ('reference_date', models.DateField()),
+                ('prompt', models.TextField(help_text='Normalized prompt')),
+                ('result', models.JSONField(help_text='Extracted task details')),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Extraction Cache Entry',
+                'verbose_name_plural': 'Extraction Cache',
+                'ordering': ['-last_used_at'],
+                'indexes': [models.Index(fields=['last_used_at'], name='extraction_last_used_idx'), models.Index(fields=['created_at'], name='extraction_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tracker', '0011_extraction_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AITaskJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prompt', models.TextField(blank=True, help_text='Task description (filled in from the audio if transcribed)')),
+                ('audio_file', models.FileField(blank=True, help_text='Voice note to transcribe when no prompt is given', upload_to='ai_jobs/')),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('priority', models.CharField(blank=True, choices=[('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High')], max_length=10)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', help_text='Processing state of the job', max_length=10)),
+                ('progress', models.CharField(blank=True, help_text='Current processing step', max_length=100)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('assigned_to', models.ManyToManyField(blank=True, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('created_by', models.ForeignKey(help_text='User who submitted the job', on_delete=django.db.models.deletion.CASCADE, related_name='ai_task_jobs', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(blank=True, help_text='Task created by the job', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tracker.task')),
+            ],
+            options={
+                'verbose_name': 'AI Task Job',
+                'verbose_name_plural': 'AI Task Jobs',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='aitaskjob_status_created_idx')],
+            },
+        ),
+    ]
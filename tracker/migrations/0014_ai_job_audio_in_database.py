@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0013_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='aitaskjob',
+            name='audio_file',
+        ),
+        migrations.AddField(
+            model_name='aitaskjob',
+            name='audio_data',
+            field=models.BinaryField(blank=True, default=b'', help_text='Voice note to transcribe when no prompt is given (cleared once processed)'),
+        ),
+        migrations.AddField(
+            model_name='aitaskjob',
+            name='audio_name',
+            field=models.CharField(blank=True, help_text='File name of the uploaded voice note', max_length=255),
+        ),
+    ]
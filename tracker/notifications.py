@@ -0,0 +1,292 @@
+# tracker/notifications.py
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import OutboxMessage, Task
+from .utils import deliver_whatsapp_message, get_twilio_error_class
+
+logger = logging.getLogger('tracker')
+
+
+def queue_status_change_notifications(task, old_status, new_status):
+    """
+    Write one outbox message per assigned user with a phone number.
+
+    Call this inside the transaction that changes the task so the messages
+    are committed (or rolled back) together with the change.
+
+    Args:
+        task: The Task object that was updated
+        old_status: Previous status value
+        new_status: New status value
+
+    Returns:
+        int: The number of messages queued
+    """
+    send_after = coalesce_until()
+    messages = [
+        message for message in (
+            status_change_message(user, task, old_status, new_status, send_after)
+            for user in task.assigned_to.select_related('profile')
+        )
+        if message is not None
+    ]
+    OutboxMessage.objects.bulk_create(messages)
+    return len(messages)
+
+
+def queue_bulk_status_change_notifications(tasks, old_statuses, new_status):
+    """
+    Write the outbox messages for many tasks moved to the same status.
+
+    The assignees of all tasks are read in one query and the messages are
+    inserted with one ``bulk_create``; call this inside the transaction
+    that updates the tasks.
+
+    Args:
+        tasks: The updated Task objects
+        old_statuses: Mapping of task id to its previous status
+        new_status: The status every task was moved to
+
+    Returns:
+        int: The number of messages queued
+    """
+    tasks_by_id = {task.id: task for task in tasks}
+    if not tasks_by_id:
+        return 0
+    assignments = Task.assigned_to.through.objects.filter(task_id__in=tasks_by_id).select_related('user__profile')
+
+    send_after = coalesce_until()
+    messages = []
+    for assignment in assignments:
+        task = tasks_by_id[assignment.task_id]
+        message = status_change_message(assignment.user, task, old_statuses[task.id], new_status, send_after)
+        if message is not None:
+            messages.append(message)
+    OutboxMessage.objects.bulk_create(messages, batch_size=settings.BULK_INSERT_BATCH_SIZE)
+    return len(messages)
+
+
+def coalesce_until():
+    """Hold new messages for the coalescing window so later changes can join the same digest"""
+    return timezone.now() + timedelta(seconds=settings.NOTIFICATION_COALESCE_SECONDS)
+
+
+def status_change_message(user, task, old_status, new_status, send_after):
+    """Return the unsaved outbox message telling ``user`` about a status change, or None without a phone number"""
+    profile = getattr(user, 'profile', None)
+    if not profile or not profile.phone_number:
+        return None
+    logger.debug(f"Queueing notification for {user.username} on status change: {old_status} → {new_status}")
+    return OutboxMessage(
+        recipient=user,
+        task=task,
+        to_number=profile.phone_number,
+        body=f"Hi {user.username}, the task '{task.title}' status changed from {old_status} to {new_status}.",
+        old_status=old_status or '',
+        new_status=new_status,
+        next_attempt_at=send_after,
+    )
+
+
+def retry_delay(attempts):
+    """Return the exponential backoff before retry number ``attempts``"""
+    delay = settings.NOTIFICATION_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(delay, settings.NOTIFICATION_RETRY_MAX_SECONDS))
+
+
+def is_permanent_error(error):
+    """Twilio 4xx errors (other than rate limiting) will fail the same way on retry"""
+    return (
+        isinstance(error, get_twilio_error_class())
+        and error.status is not None
+        and 400 <= error.status < 500
+        and error.status != 429
+    )
+
+
+def digest_key(message):
+    """Messages about the same task's status share a digest line; others get a line each"""
+    if message.task_id is None or not message.new_status:
+        return ('message', message.id)
+    return ('task', message.task_id)
+
+
+def build_digest(messages):
+    """
+    Merge several outbox messages for one number into a single message body.
+
+    Consecutive changes to the same task are folded into one line
+    (``'Survey': Not Started → In Progress → Approved``); messages that do
+    not describe a status change are included verbatim. Use
+    ``split_digest`` first so the body fits in one message.
+
+    Args:
+        messages: Outbox messages for the same number, oldest first
+
+    Returns:
+        str: The message text to send
+    """
+    if len(messages) == 1:
+        return messages[0].body
+
+    lines = {}
+    for message in messages:
+        key = digest_key(message)
+        if key[0] == 'message':
+            lines[key] = [message.body]
+            continue
+        chain = lines.setdefault(key, [message.task.title])
+        if len(chain) == 1 or chain[-1] != message.old_status:
+            chain.append(message.old_status or '(none)')
+        chain.append(message.new_status)
+
+    recipient = messages[0].recipient
+    greeting = f"Hi {recipient.username}" if recipient else "Hi"
+    body = [f"{greeting}, {len(messages)} updates on your tasks:"]
+    for (kind, _), chain in lines.items():
+        if kind == 'task':
+            body.append(f"- '{chain[0]}': {' → '.join(chain[1:])}")
+        else:
+            body.append(f"- {chain[0]}")
+    return '\n'.join(body)
+
+
+def truncate_body(body, limit=None):
+    """Cut a body that is still too long (e.g. one very long title) instead of having Twilio reject it"""
+    limit = limit or settings.NOTIFICATION_MAX_BODY_CHARS
+    return body if len(body) <= limit else body[:limit - 1] + '…'
+
+
+def split_digest(messages, limit=None):
+    """
+    Split one number's messages into groups whose digests fit in one message.
+
+    WhatsApp bodies are limited to ``NOTIFICATION_MAX_BODY_CHARS``; a bulk
+    status change can queue hundreds of messages for one assignee, so they
+    go out as several digests instead of one that Twilio would reject.
+    All messages about one task stay in the same group.
+
+    Args:
+        messages: Outbox messages for the same number, oldest first
+        limit: Maximum body length (defaults to ``NOTIFICATION_MAX_BODY_CHARS``)
+
+    Returns:
+        list: Lists of messages, each to be sent as one digest
+    """
+    limit = limit or settings.NOTIFICATION_MAX_BODY_CHARS
+    lines = {}
+    for message in messages:
+        lines.setdefault(digest_key(message), []).append(message)
+
+    parts, current = [], []
+    for line in lines.values():
+        if current and len(build_digest(current + line)) > limit:
+            parts.append(current)
+            current = []
+        current = current + line
+    if current:
+        parts.append(current)
+    return parts
+
+
+def claim_due_messages(batch_size, now=None):
+    """
+    Reserve pending messages that are due for sending, grouped by number.
+
+    Up to ``batch_size`` due messages are claimed, together with any other
+    never-attempted messages for the same numbers that are still inside
+    their coalescing window, so each number gets one digest.
+
+    Claimed rows have ``next_attempt_at`` pushed forward by the lease time,
+    so other workers skip them; if this worker dies, they become due again
+    when the lease runs out. On PostgreSQL rows locked by another worker
+    are skipped rather than waited for.
+
+    Returns:
+        list: One list of messages (oldest first) per phone number
+    """
+    now = now or timezone.now()
+    lease_until = now + timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS)
+    window_end = now + timedelta(seconds=settings.NOTIFICATION_COALESCE_SECONDS)
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    with transaction.atomic():
+        due = OutboxMessage.objects.filter(status='pending', next_attempt_at__lte=now).order_by('next_attempt_at', 'id')
+        if skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        due = list(due.values_list('id', 'to_number')[:batch_size])
+        ids = {message_id for message_id, _ in due}
+
+        waiting = OutboxMessage.objects.filter(
+            status='pending',
+            attempts=0,
+            next_attempt_at__lte=window_end,
+            to_number__in={number for _, number in due},
+        ).exclude(id__in=ids).order_by()
+        if skip_locked:
+            waiting = waiting.select_for_update(skip_locked=True)
+        ids.update(waiting.values_list('id', flat=True))
+        OutboxMessage.objects.filter(id__in=ids).update(next_attempt_at=lease_until)
+
+    groups = {}
+    claimed = OutboxMessage.objects.filter(id__in=ids).select_related('recipient', 'task').order_by('created_at', 'id')
+    for message in claimed:
+        groups.setdefault(message.to_number, []).append(message)
+    return list(groups.values())
+
+
+def deliver(messages, now=None):
+    """
+    Send one or more outbox messages for the same number as one message
+    and record the outcome on every row.
+
+    Returns:
+        bool: True if the message was sent
+    """
+    now = now or timezone.now()
+    to_number = messages[0].to_number
+    ids = [message.id for message in messages]
+    attempts = max(message.attempts for message in messages) + 1
+    changes = {'attempts': attempts}
+    try:
+        changes['provider_id'] = deliver_whatsapp_message(to_number, truncate_body(build_digest(messages)))
+    except Exception as e:
+        changes['last_error'] = str(e)
+        if is_permanent_error(e) or attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+            changes['status'] = 'failed'
+            logger.error(f"Giving up on notifications {ids} to {to_number} after {attempts} attempts: {e}")
+        else:
+            changes['next_attempt_at'] = now + retry_delay(attempts)
+            logger.warning(f"Notifications {ids} to {to_number} failed (attempt {attempts}), retrying at {changes['next_attempt_at']}: {e}")
+    else:
+        changes.update(status='sent', sent_at=now, last_error='')
+        if len(messages) > 1:
+            logger.info(f"Sent {len(messages)} notifications to {to_number} as one digest")
+    OutboxMessage.objects.filter(id__in=ids).update(**changes)
+    for message in messages:
+        for field, value in changes.items():
+            setattr(message, field, value)
+    return changes.get('status') == 'sent'
+
+
+def process_outbox_batch(batch_size=None):
+    """
+    Claim one batch of due outbox messages and send one message per number.
+
+    Returns:
+        tuple: (number of messages attempted, number sent successfully)
+    """
+    groups = claim_due_messages(batch_size or settings.NOTIFICATION_BATCH_SIZE)
+    attempted = sent = 0
+    for messages in groups:
+        for part in split_digest(messages):
+            attempted += len(part)
+            if deliver(part):
+                sent += len(part)
+    if groups:
+        logger.info(f"Notification batch processed: {sent}/{attempted} sent in {len(groups)} messages")
+    return attempted, sent
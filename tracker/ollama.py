@@ -0,0 +1,351 @@
+# tracker/ollama.py
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger('tracker')
+
+# Per-process Ollama client, created on first use and reused for every generation
+_ollama_client = None
+_ollama_client_lock = threading.Lock()
+
+
+class OllamaError(Exception):
+    """Raised when Ollama cannot be reached or returns an unusable response"""
+
+
+class CircuitOpenError(OllamaError):
+    """Raised instead of calling Ollama while its circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker whose state lives in the shared cache, so every worker
+    process sees the same view of a backend's health.
+
+    The circuit opens after ``failure_threshold`` failures (errors or calls
+    slower than ``slow_seconds``) within ``window_seconds``. While it is open,
+    callers are refused immediately; after ``reset_seconds`` one caller starts
+    a background probe, and the circuit closes again when the probe succeeds.
+    """
+
+    def __init__(self, name, probe=None, failure_threshold=None, window_seconds=None, reset_seconds=None, slow_seconds=None):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold or settings.OLLAMA_BREAKER_FAILURE_THRESHOLD
+        self.window_seconds = window_seconds or settings.OLLAMA_BREAKER_WINDOW_SECONDS
+        self.reset_seconds = reset_seconds or settings.OLLAMA_BREAKER_RESET_SECONDS
+        self.slow_seconds = slow_seconds or settings.OLLAMA_BREAKER_SLOW_SECONDS
+        self.probe_thread = None
+
+    def _key(self, suffix):
+        return f"tracker:breaker:{self.name}:{suffix}"
+
+    @property
+    def is_open(self):
+        return cache.get(self._key('opened_at')) is not None
+
+    def allow_request(self):
+        """
+        Return True if a call may go through.
+
+        While the circuit is open this returns False; once the reset time has
+        passed, the first caller also starts a background probe.
+        """
+        opened_at = cache.get(self._key('opened_at'))
+        if opened_at is None:
+            return True
+        if time.time() - opened_at >= self.reset_seconds and cache.add(self._key('probing'), True, self.reset_seconds):
+            self.probe_thread = threading.Thread(target=self.run_probe, name=f"{self.name}-probe", daemon=True)
+            self.probe_thread.start()
+        return False
+
+    def run_probe(self):
+        """Check the backend once and close the circuit, or restart the cooldown"""
+        try:
+            self.probe()
+        except Exception as e:
+            cache.set(self._key('opened_at'), time.time(), None)
+            logger.warning(f"{self.name} probe failed, circuit stays open: {e}")
+        else:
+            self.reset()
+            logger.info(f"{self.name} probe succeeded, circuit closed")
+        finally:
+            cache.delete(self._key('probing'))
+
+    def record_success(self, latency):
+        """Record a completed call; slow calls count as failures"""
+        self._record_latency(latency)
+        if latency > self.slow_seconds:
+            self.record_failure(f"slow response ({latency:.1f}s)")
+        else:
+            cache.delete(self._key('failures'))
+
+    def record_failure(self, reason=''):
+        """Record a failed call and open the circuit once failures reach the threshold"""
+        key = self._key('failures')
+        cache.add(key, 0, self.window_seconds)
+        try:
+            failures = cache.incr(key)
+        except ValueError:
+            # The counter expired between add() and incr()
+            cache.set(key, 1, self.window_seconds)
+            failures = 1
+        if failures >= self.failure_threshold and cache.add(self._key('opened_at'), time.time(), None):
+            logger.error(f"{self.name} circuit opened after {failures} failures: {reason}")
+
+    def _record_latency(self, latency):
+        key = self._key('latency')
+        average = cache.get(key)
+        # Exponentially weighted so the figure follows recent behaviour
+        average = latency if average is None else 0.8 * average + 0.2 * latency
+        cache.set(key, average, None)
+
+    def reset(self):
+        """Close the circuit and forget recent failures"""
+        cache.delete_many([self._key('opened_at'), self._key('failures')])
+
+    def snapshot(self):
+        """
+        Return the shared health state.
+
+        Returns:
+            dict: ``state`` ('open' or 'closed'), ``failures`` in the current
+            window, ``avg_latency`` in seconds and ``opened_at`` (epoch seconds)
+        """
+        values = cache.get_many([self._key(name) for name in ('opened_at', 'failures', 'latency')])
+        opened_at = values.get(self._key('opened_at'))
+        return {
+            'state': 'open' if opened_at is not None else 'closed',
+            'failures': values.get(self._key('failures'), 0),
+            'avg_latency': values.get(self._key('latency')),
+            'opened_at': opened_at,
+        }
+
+
+class JSONObjectDetector:
+    """
+    Track streamed text and notice when the first top-level JSON object is complete.
+
+    Counts braces outside of string literals (honouring backslash escapes),
+    so generation can stop as soon as the closing brace arrives instead of
+    waiting for the model to finish emitting trailing whitespace or tokens.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self.depth = 0
+        self.started = False
+        self.complete = False
+        self.end = None
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk):
+        """
+        Add a chunk of streamed text.
+
+        Returns:
+            bool: True once a complete top-level object has been seen
+        """
+        if self.complete:
+            return True
+        offset = len(self.text)
+        self.text += chunk
+        for index, char in enumerate(chunk, start=offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"' and self.started:
+                self._in_string = True
+            elif char == '{':
+                self.started = True
+                self.depth += 1
+            elif char == '}' and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete = True
+                    self.end = index + 1
+                    break
+        return self.complete
+
+    @property
+    def document(self):
+        """The text of the first JSON object, or everything received so far"""
+        if self.complete:
+            return self.text[self.text.index('{'):self.end]
+        return self.text
+
+
+class OllamaClient:
+    """
+    Small Ollama API client that keeps its HTTP connections open.
+
+    One ``requests.Session`` with a connection pool is shared by every
+    call, and generations are streamed so callers see tokens as they
+    arrive and can stop reading early. Calls go through a circuit breaker
+    so an unavailable or slow server is skipped instead of waited on.
+    """
+
+    def __init__(self, base_url=None, model=None, connect_timeout=None, read_timeout=None, pool_maxsize=None, total_timeout=None):
+        self.base_url = (base_url or settings.OLLAMA_BASE_URL).rstrip('/')
+        self.model = model or settings.OLLAMA_MODEL
+        self.timeout = (
+            connect_timeout or settings.OLLAMA_CONNECT_TIMEOUT,
+            read_timeout or settings.OLLAMA_READ_TIMEOUT,
+        )
+        self.total_timeout = total_timeout or settings.OLLAMA_TIMEOUT
+        # Imported here so loading tracker.utils does not pull in requests
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize or settings.OLLAMA_POOL_MAXSIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.breaker = CircuitBreaker('ollama', probe=self.ping)
+
+    def ping(self):
+        """Check that the server answers, raising OllamaError if it does not"""
+        import requests
+
+        try:
+            self.session.get(f"{self.base_url}/api/tags", timeout=self.timeout[0]).raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise OllamaError(str(e)) from e
+
+    def stream_generate(self, prompt, system=None, format='json', read_timeout=None):
+        """
+        Stream a completion from ``/api/generate``.
+
+        Args:
+            prompt: The user prompt
+            system: Optional system prompt
+            format: Response format requested from the model ('json' or None)
+            read_timeout: Longest gap allowed between chunks (defaults to ``OLLAMA_READ_TIMEOUT``)
+
+        Yields:
+            str: Each chunk of generated text as it arrives
+
+        Raises:
+            OllamaError: If the request fails or the stream reports an error
+        """
+        import requests
+
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+        }
+        if system:
+            payload["system"] = system
+        if format:
+            payload["format"] = format
+
+        try:
+            timeout = (self.timeout[0], read_timeout or self.timeout[1])
+            response = self.session.post(f"{self.base_url}/api/generate", json=payload, stream=True, timeout=timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise OllamaError(str(e)) from e
+
+        # Closing the response on exit (including when the caller stops early)
+        # aborts the generation instead of reading it to the end
+        with response:
+            try:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    if event.get('error'):
+                        raise OllamaError(event['error'])
+                    if event.get('response'):
+                        yield event['response']
+                    if event.get('done'):
+                        break
+            except (requests.exceptions.RequestException, ValueError) as e:
+                raise OllamaError(str(e)) from e
+
+    def stream_json(self, prompt, system=None, timeout=None):
+        """
+        Stream a JSON completion and stop as soon as the object is complete.
+
+        ``timeout`` lets a caller that cannot wait for ``OLLAMA_TIMEOUT``
+        (such as a request thread) use a shorter limit; it also caps the
+        gap allowed between chunks. Running past a caller's own limit is
+        not counted as a failure by the circuit breaker.
+
+        Yields:
+            tuple: ``('progress', text so far)`` for every chunk, then
+            ``('result', parsed object)`` once the JSON object is complete
+
+        Raises:
+            CircuitOpenError: If recent calls failed and the circuit is open
+            OllamaError: If the call fails, runs past ``timeout`` (or
+                ``OLLAMA_TIMEOUT``) or the stream ends without a parseable JSON object
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError("Ollama circuit is open")
+
+        detector = JSONObjectDetector()
+        limit = timeout or self.total_timeout
+        read_timeout = min(self.timeout[1], limit)
+        started = time.monotonic()
+        try:
+            for chunk in self.stream_generate(prompt, system=system, format='json', read_timeout=read_timeout):
+                done = detector.feed(chunk)
+                yield 'progress', detector.document
+                if done:
+                    logger.debug(f"Ollama JSON complete after {time.monotonic() - started:.2f}s, closing stream early")
+                    break
+                if time.monotonic() - started > limit:
+                    raise OllamaError(f"Ollama generation exceeded {limit}s")
+        except OllamaError as e:
+            # A caller's shorter limit running out says nothing about the server's health
+            if not timeout or time.monotonic() - started < timeout:
+                self.breaker.record_failure(str(e))
+            raise
+        elapsed = time.monotonic() - started
+
+        # Unparseable output counts as a failure, so a misbehaving model still trips the breaker
+        try:
+            result = json.loads(detector.document)
+        except ValueError as e:
+            self.breaker.record_failure(f"invalid JSON: {e}")
+            raise OllamaError(f"Ollama returned invalid JSON: {e}") from e
+        self.breaker.record_success(elapsed)
+        yield 'result', result
+
+    def generate_json(self, prompt, system=None):
+        """Return the parsed JSON object generated for ``prompt``"""
+        for kind, value in self.stream_json(prompt, system=system):
+            if kind == 'result':
+                return value
+
+
+def get_ollama_client():
+    """Return the shared per-process Ollama client, creating it on first use"""
+    global _ollama_client
+    if _ollama_client is None:
+        with _ollama_client_lock:
+            if _ollama_client is None:
+                _ollama_client = OllamaClient()
+                logger.info(f"Created Ollama client for {_ollama_client.base_url} ({_ollama_client.model})")
+    return _ollama_client
+
+
+def reset_ollama_client():
+    """Drop the shared client so the next call builds a new one (e.g. after settings change)"""
+    global _ollama_client
+    with _ollama_client_lock:
+        if _ollama_client is not None:
+            _ollama_client.session.close()
+        _ollama_client = None
@@ -0,0 +1,250 @@
+# tracker/pagination.py
+import base64
+import binascii
+import json
+import logging
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+logger = logging.getLogger('tracker')
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not fit the ordering"""
+
+
+def get_keyset_ordering(queryset):
+    """
+    Return the ordering used for keyset pagination as (field, descending) pairs.
+
+    Uses the queryset's explicit ordering, falling back to the model's
+    ``Meta.ordering``, and appends the primary key as a tie-breaker so
+    every row has a unique position.
+    """
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    fields = []
+    for item in ordering:
+        if not isinstance(item, str):
+            raise ValueError(f"Keyset pagination only supports field-name ordering, got {item!r}")
+        descending = item.startswith('-')
+        name = item.lstrip('-')
+        if name == 'pk':
+            name = queryset.model._meta.pk.name
+        fields.append((name, descending))
+
+    pk_name = queryset.model._meta.pk.name
+    if pk_name not in [name for name, _ in fields]:
+        fields.append((pk_name, False))
+    return fields
+
+
+def encode_cursor(position, reverse=False):
+    """Encode a row position (list of ordering values) into an opaque cursor string"""
+    payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor string into (position, reverse), raising InvalidCursor if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return list(data['p']), bool(data['r'])
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+
+
+def _keyset_filter(fields, position, reverse):
+    """
+    Build the WHERE clause selecting rows strictly after ``position``.
+
+    For ordering (a DESC, b ASC, id ASC) this expands to
+    ``a < x OR (a = x AND b > y) OR (a = x AND b = y AND id > z)``, which
+    the database can answer with an index range scan instead of an OFFSET.
+    """
+    condition = Q()
+    for index, (name, descending) in enumerate(fields):
+        # Walking backwards flips every comparison
+        lookup = 'lt' if descending != reverse else 'gt'
+        clause = Q(**{f"{name}__{lookup}": position[index]})
+        for prev_index in range(index):
+            clause &= Q(**{fields[prev_index][0]: position[prev_index]})
+        condition |= clause
+    return condition
+
+
+class KeysetPage:
+    """One page of keyset-paginated results with cursors to its neighbours"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def paginate_keyset(queryset, cursor=None, page_size=None):
+    """
+    Fetch one page of ``queryset`` using keyset (cursor) pagination.
+
+    Each page is selected with a range condition on the ordering columns
+    rather than an OFFSET, so the cost of a page does not grow with its depth.
+
+    Args:
+        queryset: The queryset to paginate; its ordering (or the model's
+            default ordering) defines the page order
+        cursor: A cursor from a previous page's ``next_cursor`` or
+            ``previous_cursor``, or None for the first page
+        page_size: Number of rows per page (defaults to ``TASK_PAGE_SIZE``)
+
+    Returns:
+        KeysetPage: The rows of the page and cursors to its neighbours
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    page_size = page_size or settings.TASK_PAGE_SIZE
+    fields = get_keyset_ordering(queryset)
+
+    position, reverse = None, False
+    if cursor:
+        position, reverse = decode_cursor(cursor)
+        if len(position) != len(fields):
+            raise InvalidCursor(f"Cursor does not match ordering: {cursor!r}")
+
+    order_by = [('-' if descending != reverse else '') + name for name, descending in fields]
+    page_query = queryset.order_by(*order_by)
+    if position is not None:
+        page_query = page_query.filter(_keyset_filter(fields, position, reverse))
+
+    try:
+        rows = list(page_query[:page_size + 1])
+    except (ValidationError, ValueError, TypeError):
+        # Cursor values that cannot be converted to the column types
+        raise InvalidCursor(f"Cursor does not match ordering: {cursor!r}")
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+
+    def position_of(obj):
+        return [
+            queryset.model._meta.get_field(name).value_to_string(obj)
+            for name, _ in fields
+        ]
+
+    next_cursor = previous_cursor = None
+    if rows:
+        # Going forwards, a previous page exists whenever we started from a cursor;
+        # going backwards, a next page always exists (it is where we came from)
+        if (has_more and not reverse) or (reverse and position is not None):
+            next_cursor = encode_cursor(position_of(rows[-1]))
+        if (has_more and reverse) or (not reverse and position is not None):
+            previous_cursor = encode_cursor(position_of(rows[0]), reverse=True)
+
+    return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+class KeysetPagination(BasePagination):
+    """
+    DRF pagination class using keyset cursors over the queryset ordering.
+
+    Responses have the shape ``{"next": url, "previous": url, "results": [...]}``.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return settings.TASK_PAGE_SIZE
+        if requested <= 0:
+            return settings.TASK_PAGE_SIZE
+        return min(requested, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        try:
+            self.page = paginate_keyset(
+                queryset,
+                cursor=request.query_params.get(self.cursor_query_param),
+                page_size=self.get_page_size(request),
+            )
+        except InvalidCursor as e:
+            logger.warning(str(e))
+            raise NotFound(self.invalid_cursor_message)
+        return list(self.page)
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_link(self.page.next_cursor),
+            'previous': self.get_link(self.page.previous_cursor),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses PostgreSQL's planner row estimate instead of an
+    exact ``COUNT(*)`` for unfiltered querysets over large tables.
+
+    Filtered querysets, small tables and other databases fall back to an
+    exact count.
+    """
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.estimate_threshold:
+                return row[0]
+        return super().count
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Task, Category, Role
+from .models import STATUS_CHOICES, Task, TaskHistory, Category, Role
+from django.conf import settings
 from django.contrib.auth.models import User
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -14,6 +15,31 @@ class TaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = '__all__'
 
+class TaskHistorySerializer(serializers.ModelSerializer):
+    actor = serializers.SlugRelatedField(slug_field='username', read_only=True)
+
+    class Meta:
+        model = TaskHistory
+        fields = ['id', 'task', 'actor', 'old_status', 'new_status', 'created_at']
+
+class PromptBatchSerializer(serializers.Serializer):
+    """Input for creating many tasks from free-text prompts in one request"""
+    prompts = serializers.ListField(
+        child=serializers.CharField(max_length=5000),
+        allow_empty=False,
+        max_length=settings.BULK_PROMPT_LIMIT,
+    )
+    assigned_to = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), many=True, required=False)
+
+class BulkStatusSerializer(serializers.Serializer):
+    """Input for moving many tasks to one status in one request"""
+    task_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_STATUS_MAX_TASKS,
+    )
+    status = serializers.ChoiceField(choices=STATUS_CHOICES)
+
 class RoleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Role
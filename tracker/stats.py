@@ -0,0 +1,145 @@
+# tracker/stats.py
+import logging
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .models import Task, Category, STATUS_CHOICES, CATEGORY_COUNTER_FIELDS
+
+logger = logging.getLogger('tracker')
+
+# Bumped whenever tasks or roles change so every cached per-user count goes stale at once
+TASK_COUNTS_VERSION_KEY = 'tracker:task-counts:version'
+# When rows last left some user's lists (deletes, unassignments, role changes); the
+# newest updated_at among the rows still listed cannot show that on its own
+ROWS_REMOVED_AT_KEY = 'tracker:rows-removed-at'
+
+
+def status_key(status):
+    """Turn a status value like 'In Progress' into a stats key like 'in_progress'"""
+    return slugify(status).replace('-', '_')
+
+
+def get_task_stats(user=None, queryset=None, today=None):
+    """
+    Compute task statistics with a single conditional-aggregation query.
+
+    Args:
+        user: The user whose visible tasks should be counted
+        queryset: An already-scoped Task queryset (used instead of ``user``)
+        today: The reference date for overdue checks (defaults to today)
+
+    Returns:
+        dict: ``total``, ``overdue`` and one count per status keyed by
+        ``status_key(status)`` (e.g. ``in_progress``, ``approved``)
+    """
+    if queryset is None:
+        queryset = Task.objects.for_user(user)
+    today = today or date.today()
+
+    aggregates = {
+        'total': Count('id'),
+        'overdue': Count('id', filter=Q(due_date__lt=today)),
+    }
+    for value, _label in STATUS_CHOICES:
+        aggregates[status_key(value)] = Count('id', filter=Q(status=value))
+
+    stats = queryset.order_by().aggregate(**aggregates)
+    logger.debug(f"Task stats computed: {stats}")
+    return stats
+
+
+def _task_counts_version():
+    """Return the current task-count cache generation, creating it if missing"""
+    version = cache.get(TASK_COUNTS_VERSION_KEY)
+    if version is None:
+        cache.add(TASK_COUNTS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(TASK_COUNTS_VERSION_KEY)
+    return version
+
+
+def invalidate_task_counts():
+    """Mark all cached per-user task counts as stale"""
+    cache.set(TASK_COUNTS_VERSION_KEY, time.time_ns(), None)
+
+
+def mark_rows_removed():
+    """Record that tasks or categories may have disappeared from some users' lists"""
+    cache.set(ROWS_REMOVED_AT_KEY, timezone.now(), None)
+
+
+def get_rows_removed_at():
+    """Return when rows last left a list (see ``mark_rows_removed``), or None"""
+    return cache.get(ROWS_REMOVED_AT_KEY)
+
+
+def pending_counts_query(user):
+    """Return the ``GROUP BY category_id`` query counting a user's pending tasks"""
+    return (
+        Task.objects.for_user(user)
+        .exclude(status='Approved')
+        .order_by()
+        .values('category_id')
+        .annotate(count=Count('id'))
+    )
+
+
+def get_pending_counts_by_category(user):
+    """
+    Return the number of pending (not approved) tasks per category for a user.
+
+    Counts come from a single ``GROUP BY category_id`` query over the tasks
+    the user can see and are cached per user until a task or role changes.
+
+    Args:
+        user: The user whose visible tasks should be counted
+
+    Returns:
+        dict: Mapping of category id to pending task count (categories
+        without pending tasks are omitted)
+    """
+    cache_key = f"tracker:pending-counts:{user.pk}:{_task_counts_version()}"
+    counts = cache.get(cache_key)
+    if counts is None:
+        counts = {row['category_id']: row['count'] for row in pending_counts_query(user)}
+        cache.set(cache_key, counts, settings.TASK_COUNT_CACHE_TIMEOUT)
+    return counts
+
+
+def rebuild_category_counters(today=None):
+    """
+    Recompute every Category's task counters from the tasks table.
+
+    Counts come from one aggregate query over all categories and are
+    written back with ``bulk_update``.
+
+    Args:
+        today: The reference date for overdue counts (defaults to today)
+
+    Returns:
+        int: The number of categories whose counters changed
+    """
+    today = today or date.today()
+    now = timezone.now()
+    categories = Category.objects.annotate(
+        task_total=Count('task'),
+        task_open=Count('task', filter=~Q(task__status='Approved')),
+        task_approved=Count('task', filter=Q(task__status='Approved')),
+        task_overdue=Count('task', filter=Q(task__due_date__lt=today)),
+    )
+    changed = []
+    for category in categories:
+        counts = (category.task_total, category.task_open, category.task_approved, category.task_overdue)
+        if counts != tuple(getattr(category, field) for field in CATEGORY_COUNTER_FIELDS):
+            for field, value in zip(CATEGORY_COUNTER_FIELDS, counts):
+                setattr(category, field, value)
+            category.updated_at = now
+            changed.append(category)
+    Category.objects.bulk_update(changed, CATEGORY_COUNTER_FIELDS + ('updated_at',), batch_size=500)
+    logger.info(f"Rebuilt task counters for {len(changed)} categories")
+    return len(changed)
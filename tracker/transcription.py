@@ -0,0 +1,106 @@
+# tracker/transcription.py
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger('tracker')
+
+# Whisper models loaded in this process, by model name
+_whisper_models = {}
+_whisper_models_lock = threading.Lock()
+# One transcription at a time per process keeps peak memory to a single inference
+_inference_lock = threading.Lock()
+_transcription_stats = {
+    'model_loads': 0,
+    'load_seconds': 0.0,
+    'transcriptions': 0,
+    'failures': 0,
+    'inference_seconds': 0.0,
+}
+
+
+def get_whisper_model(name=None):
+    """
+    Return the Whisper model ``name`` (default ``WHISPER_MODEL``), loading it on first use.
+
+    The model is kept for the life of the process so its weights are read
+    from disk and allocated only once.
+
+    Raises:
+        ImportError: If Whisper is not installed
+    """
+    name = name or settings.WHISPER_MODEL
+    model = _whisper_models.get(name)
+    if model is None:
+        with _whisper_models_lock:
+            model = _whisper_models.get(name)
+            if model is None:
+                import whisper
+
+                started = time.monotonic()
+                model = whisper.load_model(name)
+                elapsed = time.monotonic() - started
+                _whisper_models[name] = model
+                _transcription_stats['model_loads'] += 1
+                _transcription_stats['load_seconds'] += elapsed
+                logger.info(f"Loaded Whisper model '{name}' in {elapsed:.2f}s")
+    return model
+
+
+def warm_up_whisper():
+    """
+    Load the configured Whisper model ahead of the first request.
+
+    Returns:
+        bool: True if the model is loaded, False if Whisper is unavailable
+    """
+    try:
+        get_whisper_model()
+    except ImportError:
+        logger.warning("Whisper is not installed; skipping model warmup")
+        return False
+    except Exception as e:
+        logger.error(f"Failed to warm up Whisper model: {str(e)}")
+        return False
+    return True
+
+
+def run_transcription(audio):
+    """
+    Transcribe ``audio`` (a file path or 16 kHz mono float32 samples) with the cached model.
+
+    Returns:
+        str: The transcribed text
+
+    Raises:
+        ImportError: If Whisper is not installed
+    """
+    model = get_whisper_model()
+    with _inference_lock:
+        started = time.monotonic()
+        try:
+            result = model.transcribe(audio)
+        except Exception:
+            _transcription_stats['failures'] += 1
+            raise
+        finally:
+            _transcription_stats['inference_seconds'] += time.monotonic() - started
+    _transcription_stats['transcriptions'] += 1
+    return result["text"]
+
+
+def get_transcription_stats():
+    """
+    Return this process's Whisper metrics.
+
+    Returns:
+        dict: ``model_loads`` and ``load_seconds`` (time spent loading weights),
+        ``transcriptions``, ``failures``, ``inference_seconds`` and
+        ``avg_inference_seconds``
+    """
+    stats = dict(_transcription_stats)
+    attempts = stats['transcriptions'] + stats['failures']
+    stats['avg_inference_seconds'] = round(stats['inference_seconds'] / attempts, 3) if attempts else None
+    return stats
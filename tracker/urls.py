@@ -2,9 +2,9 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import TaskViewSet, CategoryViewSet, RoleViewSet
 from .views import (
-    user_login, user_logout, dashboard, register, update_task_status, 
+    user_login, user_logout, dashboard, register, update_task_status, bulk_update_task_status,
     task_detail, task_edit, task_create, task_gallery_view, task_gallery_view2,
-    ai_task_create
+    ai_task_create, ai_task_preview_stream, ai_task_job, ai_task_job_status
 )
 
 router = DefaultRouter()
@@ -23,10 +23,14 @@ urlpatterns += [
     path('dashboard/', dashboard, name='dashboard'),  # Dashboard for logged-in users
     path('register/', register, name='register'),  # Registration for new users (optional)
     path('task/<int:task_id>/update-status/', update_task_status, name='update_task_status'),
+    path('task/bulk-update-status/', bulk_update_task_status, name='bulk_update_task_status'),
     path('task/<int:task_id>/', task_detail, name='task_detail'),
     path('task/<int:task_id>/edit/', task_edit, name='task_edit'),
     path('task/create/', task_create, name='task_create'),
     path('task-gallery/', task_gallery_view, name='task_gallery'),
     path('task-gallery2/', task_gallery_view2, name='task_gallery2'),
     path('task/ai-create/', ai_task_create, name='ai_task_create'),
+    path('task/ai-create/stream/', ai_task_preview_stream, name='ai_task_preview_stream'),
+    path('task/ai-jobs/<int:job_id>/', ai_task_job, name='ai_task_job'),
+    path('task/ai-jobs/<int:job_id>/status/', ai_task_job_status, name='ai_task_job_status'),
 ]
@@ -1,64 +1,208 @@
+import json
 import logging
+import time
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
 from django.contrib import messages
+from django.conf import settings
 from django.db import transaction
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from datetime import date, datetime, timedelta
 
-from .models import Task, Category, Role
-from .serializers import TaskSerializer, CategorySerializer, RoleSerializer, UserSerializer
-from .forms import TaskForm, CustomUserCreationForm, AITaskForm
-from .utils import send_whatsapp_message, generate_task_from_prompt, transcribe_audio
+from .models import Task, TaskHistory, AITaskJob, Category, Role, get_user_role
+from .serializers import TaskSerializer, TaskHistorySerializer, PromptBatchSerializer, BulkStatusSerializer, CategorySerializer, RoleSerializer, UserSerializer
+from .forms import TaskForm, CustomUserCreationForm, AITaskForm, BulkStatusForm
+from .utils import stream_task_from_prompt
+from .export import EXPORT_CONTENT_TYPES, stream_export
+from .extraction import extract_many
+from .bulk import TaskImporter, bulk_create_tasks, bulk_update_status, read_import_rows
+from .notifications import queue_status_change_notifications
+from .stats import get_task_stats, get_pending_counts_by_category
+from .conditional import ConditionalGetMixin, latest, make_etag, not_modified_response, set_validators
+from .pagination import KeysetPagination, InvalidCursor, paginate_keyset
+from .filters import TaskOrderingFilter
 
 # Set up logger
 logger = logging.getLogger('tracker')
 
-class TaskViewSet(viewsets.ModelViewSet):
+# Number of most recent history entries shown on the task detail page
+TASK_DETAIL_HISTORY_LIMIT = 20
+
+# Task import document formats by request content type and by upload file extension
+IMPORT_CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'jsonl',
+    'application/jsonl': 'jsonl',
+    'application/x-jsonlines': 'jsonl',
+}
+IMPORT_EXTENSIONS = {'csv': 'csv', 'jsonl': 'jsonl', 'ndjson': 'jsonl'}
+
+class TaskViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing tasks.
     
     Provides CRUD operations for tasks with role-based access control.
+    List and detail responses carry ETag / Last-Modified headers and
+    answer conditional requests with 304 Not Modified.
     """
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    filter_backends = [TaskOrderingFilter]
 
     def get_queryset(self):
         """
         Filter tasks based on user role:
-        - Team Members see only tasks assigned to them
+        - Team Members (or users without a role) see only tasks assigned to them
         - Team Leaders see tasks they've assigned
         - Admins and Owners see all tasks
         """
-        user = self.request.user
-        
-        try:
-            role = user.role.role_type
-        except (Role.DoesNotExist, AttributeError):
-            role = None
-            
-        # Apply role-based filtering
-        if role == 'Team Member':
-            return Task.objects.filter(assigned_to=user)
-        elif role == 'Team Leader':
-            return Task.objects.filter(assigned_by=user)
-        
-        # Admins and Owners see all tasks
-        return super().get_queryset()
+        return Task.objects.visible_to(self.request.user)
     
     def perform_create(self, serializer):
         """Set the created_by field to the current user when creating a task"""
         serializer.save(created_by=self.request.user)
 
-class CategoryViewSet(viewsets.ModelViewSet):
-    """API endpoint for managing task categories"""
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """Return the task's status-change history, newest first, one page at a time"""
+        task = self.get_object()
+        entries = TaskHistory.objects.filter(task=task).select_related('actor')
+        page = self.paginate_queryset(entries)
+        serializer = TaskHistorySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Return total, overdue and per-status counts for the visible tasks"""
+        return Response(get_task_stats(request.user))
+
+    @action(detail=False, methods=['post'], url_path='from-prompts')
+    def from_prompts(self, request):
+        """
+        Create one task per prompt using the rule-based extractor.
+        
+        Expects ``{"prompts": [...], "assigned_to": [user ids]}``; tasks are
+        assigned to the listed users (or the requester) and inserted in bulk.
+        Responds with the created ids and the extraction throughput.
+        """
+        serializer = PromptBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        prompts = serializer.validated_data['prompts']
+        assignee_ids = [user.id for user in serializer.validated_data.get('assigned_to') or [request.user]]
+
+        category_ids = set(Category.objects.values_list('id', flat=True))
+        if not category_ids:
+            return Response({'detail': 'Create a category first'}, status=status.HTTP_400_BAD_REQUEST)
+        default_category_id = min(category_ids)
+
+        started = time.perf_counter()
+        tasks = []
+        for task_data in extract_many(prompts):
+            category_id = task_data['category_id']
+            tasks.append(Task(
+                title=task_data['title'][:200],
+                description=task_data['description'],
+                priority=task_data['priority'],
+                category_id=category_id if category_id in category_ids else default_category_id,
+                due_date=task_data['due_date'],
+                status='Not Started',
+                created_by=request.user,
+                assigned_by=request.user,
+            ))
+        extract_seconds = time.perf_counter() - started
+        created = bulk_create_tasks(tasks, assignees=[assignee_ids] * len(tasks))
+        total_seconds = time.perf_counter() - started
+
+        logger.info(f"{request.user.username} created {len(created)} tasks from prompts in {total_seconds:.2f}s")
+        return Response({
+            'created': len(created),
+            'ids': [task.id for task in created],
+            'extract_seconds': round(extract_seconds, 4),
+            'total_seconds': round(total_seconds, 4),
+            'prompts_per_second': round(len(created) / total_seconds) if total_seconds else None,
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_tasks(self, request):
+        """
+        Bulk-create tasks from a CSV or JSONL document.
+        
+        Send the document as the request body (``Content-Type: text/csv`` or
+        ``application/x-ndjson``) or as a multipart ``file`` upload named
+        ``*.csv`` / ``*.jsonl``. Columns: title, description, category (name
+        or id), priority, status, due_date, assigned_to (usernames separated
+        by ``;``) and comments.
+        
+        The response is streamed as JSON lines while the rows are imported:
+        one line per rejected row, a progress line per batch and a final
+        summary. Valid rows are inserted even when others are rejected.
+        """
+        upload = None
+        if request.content_type.startswith('multipart/form-data'):
+            upload = request.FILES.get('file')
+            if upload is None:
+                return Response({'detail': "Upload the document as 'file'"}, status=status.HTTP_400_BAD_REQUEST)
+            fmt = IMPORT_EXTENSIONS.get(upload.name.rsplit('.', 1)[-1].lower())
+        else:
+            fmt = IMPORT_CONTENT_TYPES.get(request.content_type.split(';')[0].strip())
+        if fmt is None:
+            return Response(
+                {'detail': "Send CSV (text/csv, .csv) or JSON lines (application/x-ndjson, .jsonl)"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+
+        # Read the upload (or the raw body) line by line instead of loading it all
+        rows = read_import_rows(upload if upload is not None else request.stream or [], fmt)
+        importer = TaskImporter(request.user)
+        events = (json.dumps(event) + '\n' for event in importer.run(rows))
+        return StreamingHttpResponse(events, content_type='application/x-ndjson')
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Download the visible tasks as CSV (``?type=csv``, the default) or JSON lines (``?type=jsonl``).
+        
+        Uses the same role scoping and ``?ordering=`` as the list, but
+        streams every matching task instead of one page, fetching them from
+        the database in chunks so memory use does not depend on the count.
+        """
+        fmt = request.query_params.get('type', 'csv')
+        if fmt not in EXPORT_CONTENT_TYPES:
+            return Response({'detail': "type must be 'csv' or 'jsonl'"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(stream_export(queryset, fmt), content_type=EXPORT_CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = f'attachment; filename="tasks-{date.today():%Y%m%d}.{fmt}"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """
+        Move many tasks to one status.
+        
+        Expects ``{"task_ids": [...], "status": "Approved"}``. Tasks the user
+        may not change (or that do not exist) are skipped and listed in
+        ``not_permitted``; the rest are updated together.
+        """
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = bulk_update_status(
+            request.user, serializer.validated_data['task_ids'], serializer.validated_data['status']
+        )
+        return Response(result)
+
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    """API endpoint for managing task categories (with conditional GET support)"""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -106,6 +250,19 @@ def user_logout(request):
     messages.success(request, 'You have been logged out successfully')
     return redirect('login')
 
+def get_task_page(request, tasks):
+    """
+    Return one keyset-paginated page of tasks for an HTML view.
+
+    The page is selected by the ``cursor`` query parameter; an invalid
+    cursor falls back to the first page.
+    """
+    try:
+        return paginate_keyset(tasks, cursor=request.GET.get('cursor'))
+    except InvalidCursor as e:
+        logger.warning(f"{e} (user {request.user.username})")
+        return paginate_keyset(tasks)
+
 @login_required
 def dashboard(request):
     """
@@ -116,37 +273,23 @@ def dashboard(request):
     # Get user role information
     is_admin = request.user.is_superuser
     
-    try:
-        user_role = request.user.role.role_type
-    except (Role.DoesNotExist, AttributeError):
-        user_role = None
-    
-    # Filter tasks based on user role
-    if is_admin or user_role == 'Owner':
-        tasks = Task.objects.all()
-    elif user_role == 'Team Leader':
-        tasks = Task.objects.filter(assigned_by=request.user)
-    else:
-        tasks = Task.objects.filter(assigned_to=request.user)
+    user_role = get_user_role(request.user)
     
-    # Mark overdue tasks
-    today = date.today()
-    for task in tasks:
-        task.is_overdue = task.due_date < today
+    # Filter tasks based on user role and fetch one page of them
+    page = get_task_page(request, Task.objects.visible_to(request.user))
     
-    # Calculate task statistics in the view for better performance
-    in_progress_count = tasks.filter(status='In Progress').count()
-    completed_count = tasks.filter(status='Approved').count()
-    overdue_count = sum(1 for task in tasks if task.due_date < today)
+    # Calculate task statistics in a single aggregate query
+    stats = get_task_stats(request.user)
     
     context = {
-        'tasks': tasks,
+        'tasks': page,
+        'page': page,
         'is_admin': is_admin,
         'user_role': user_role,
-        'in_progress_count': in_progress_count,
-        'completed_count': completed_count,
-        'overdue_count': overdue_count,
-        'total_count': tasks.count(),
+        'in_progress_count': stats['in_progress'],
+        'completed_count': stats['approved'],
+        'overdue_count': stats['overdue'],
+        'total_count': stats['total'],
     }
     
     return render(request, 'tracker/dashboard.html', context)
@@ -169,44 +312,33 @@ def register(request):
         
     return render(request, 'tracker/register.html', {'form': form})
 
-def notify_assigned_users_on_status_change(task, old_status, new_status):
+def notify_assigned_users_on_status_change(task, old_status, new_status, actor=None):
     """
-    Send WhatsApp notifications to all assigned users when a task status changes.
+    Record a status change in the task history and queue WhatsApp notifications
+    for all assigned users.
+    
+    Notifications go to the outbox and are sent by ``manage.py send_notifications``;
+    call this inside the transaction that saves the task.
     
     Args:
         task: The Task object that was updated
         old_status: Previous status value
         new_status: New status value
+        actor: The user who changed the status, if known
     """
     if old_status == new_status:
         return  # No change, no notification needed
         
-    # Update task history log
-    timestamp = date.today().strftime("%Y-%m-%d")
-    history_entry = f"{timestamp}: Status changed from '{old_status}' to '{new_status}'\n"
-    
-    if task.history_log:
-        task.history_log += history_entry
-    else:
-        task.history_log = history_entry
-    
-    task.save(update_fields=['history_log'])
-    
-    # Send notifications to all assigned users
-    for user in task.assigned_to.all():
-        try:
-            profile = getattr(user, 'profile', None)
-            if profile and profile.phone_number:
-                message = f"Hi {user.username}, the task '{task.title}' status changed from {old_status} to {new_status}."
-                logger.debug(f"Notifying {user.username} on status change: {old_status} → {new_status}")
-                result = send_whatsapp_message(profile.phone_number, message)
-                
-                if result:
-                    logger.info(f"WhatsApp notification sent to {user.username} ({profile.phone_number})")
-                else:
-                    logger.warning(f"Failed to send WhatsApp notification to {user.username}")
-        except Exception as e:
-            logger.error(f"Error notifying user {user.username}: {str(e)}")
+    # Append a history entry (a single INSERT)
+    TaskHistory.objects.create(
+        task=task,
+        actor=actor,
+        old_status=old_status or '',
+        new_status=new_status
+    )
+    
+    queued = queue_status_change_notifications(task, old_status, new_status)
+    logger.info(f"Queued {queued} WhatsApp notifications for task {task.id}")
 
 @login_required
 @require_POST
@@ -214,12 +346,13 @@ def update_task_status(request, task_id):
     """
     Update a task's status and notify assigned users of the change.
     
-    Only users assigned to the task can update its status.
+    Assignees, the assigning Team Leader, Owners and admins can update its
+    status (see ``TaskQuerySet.status_editable_by``).
     """
     task = get_object_or_404(Task, id=task_id)
     
     # Check if user is authorized to update this task
-    if request.user not in task.assigned_to.all() and not request.user.is_superuser:
+    if not Task.objects.status_editable_by(request.user).filter(id=task.id).exists():
         logger.warning(f"Unauthorized status update attempt by {request.user.username} for task {task_id}")
         messages.error(request, "You don't have permission to update this task's status")
         return redirect('dashboard')
@@ -231,18 +364,44 @@ def update_task_status(request, task_id):
         messages.error(request, "Status cannot be empty")
         return redirect('dashboard')
     
-    # Update the task status
-    task.status = new_status
-    task.save()
+    # Update the task status and queue notifications in one transaction
+    with transaction.atomic():
+        task.status = new_status
+        task.save()
+        
+        # Notify assigned users about the status change
+        notify_assigned_users_on_status_change(task, old_status, new_status, actor=request.user)
     
     logger.info(f"Task {task_id} status updated from '{old_status}' to '{new_status}' by {request.user.username}")
     
-    # Notify assigned users about the status change
-    notify_assigned_users_on_status_change(task, old_status, new_status)
-    
     messages.success(request, f"Task status updated to '{new_status}'")
     return redirect('dashboard')
 
+@login_required
+@require_POST
+def bulk_update_task_status(request):
+    """
+    Apply one status to the tasks selected on the dashboard.
+    
+    Uses the same permission rule as ``update_task_status``, checked for
+    all selected tasks at once.
+    """
+    form = BulkStatusForm(request.POST)
+    if not form.is_valid():
+        messages.error(request, "Select at least one task and a valid status")
+        return redirect('dashboard')
+    
+    new_status = form.cleaned_data['status']
+    result = bulk_update_status(request.user, form.cleaned_data['task_ids'], new_status)
+    
+    if result['updated']:
+        messages.success(request, f"{len(result['updated'])} tasks updated to '{new_status}'")
+    elif result['unchanged']:
+        messages.info(request, f"The selected tasks are already '{new_status}'")
+    if result['not_permitted']:
+        messages.error(request, f"You don't have permission to update {len(result['not_permitted'])} of the selected tasks")
+    return redirect('dashboard')
+
 @login_required
 def task_detail(request, task_id):
     """
@@ -261,7 +420,18 @@ def task_detail(request, task_id):
         messages.error(request, "You don't have permission to view this task")
         return redirect('dashboard')
     
-    return render(request, 'tracker/task_detail.html', {'task': task})
+    # The page shows the task, its category and flash messages, and embeds
+    # the CSRF token, so all of these are part of the validators
+    last_modified = latest(task.updated_at, task.category.updated_at)
+    etag = make_etag(request.user.pk, task.pk, task.updated_at, task.category.updated_at, request.META.get('CSRF_COOKIE'))
+    if not len(messages.get_messages(request)):
+        response = not_modified_response(request, etag, last_modified)
+        if response is not None:
+            return set_validators(response, etag, last_modified)
+    
+    history = task.history.select_related('actor')[:TASK_DETAIL_HISTORY_LIMIT]
+    response = render(request, 'tracker/task_detail.html', {'task': task, 'history': history})
+    return set_validators(response, etag, last_modified)
 
 @login_required
 def task_edit(request, task_id):
@@ -274,10 +444,7 @@ def task_edit(request, task_id):
     
     # Get current user and their role
     user = request.user
-    try:
-        user_role = user.role.role_type
-    except (Role.DoesNotExist, AttributeError):
-        user_role = None
+    user_role = get_user_role(user)
     
     # Check if user is authorized to edit this task
     if user not in task.assigned_to.all() and user != task.assigned_by and not user.is_superuser:
@@ -330,7 +497,7 @@ def task_edit(request, task_id):
                 
                 # Notify about status changes
                 if old_status != task.status:
-                    notify_assigned_users_on_status_change(task, old_status, task.status)
+                    notify_assigned_users_on_status_change(task, old_status, task.status, actor=user)
                 
                 logger.info(f"Task {task_id} updated by {user.username}")
                 messages.success(request, "Task updated successfully")
@@ -434,21 +601,8 @@ def task_gallery_view(request):
     """
     user = request.user
     
-    # Filter tasks based on user role
-    if user.is_superuser:
-        tasks = Task.objects.all()
-    else:
-        try:
-            role = user.role.role_type
-            if role == 'Owner':
-                tasks = Task.objects.all()
-            elif role == 'Team Leader':
-                tasks = Task.objects.filter(assigned_by=user)
-            else:  # Team Member or no role
-                tasks = Task.objects.filter(assigned_to=user)
-        except (Role.DoesNotExist, AttributeError):
-            # Default to assigned tasks if no role
-            tasks = Task.objects.filter(assigned_to=user)
+    # Filter tasks based on user role and fetch one page of them
+    page = get_task_page(request, Task.objects.visible_to(user))
     
     # Get selected task if any
     selected_id = request.GET.get("selected")
@@ -466,16 +620,19 @@ def task_gallery_view(request):
             messages.error(request, "Task not found")
     
     return render(request, 'tracker/task_gallery.html', {
-        'tasks': tasks,
+        'tasks': page,
+        'page': page,
         'selected_task': selected_task
     })
 
 @login_required
 def ai_task_create(request):
     """
-    Create a new task using AI to extract details from a text prompt.
+    Queue a task to be created by AI from a text prompt or voice input.
     
-    This view handles both text prompts and voice input (if Whisper is installed).
+    The prompt and any overrides are stored as an AITaskJob and processed by
+    ``manage.py run_ai_jobs``; the user is sent to the job's status page,
+    which redirects to the task once it exists.
     """
     categories = Category.objects.all()
     users = User.objects.all()
@@ -483,140 +640,35 @@ def ai_task_create(request):
     if request.method == "POST":
         form = AITaskForm(request.POST, request.FILES)
         if form.is_valid():
-            try:
-                # Process audio file if provided
-                audio_file = request.FILES.get('audio_file')
-                prompt = form.cleaned_data.get('prompt', '')
-                
-                if audio_file and not prompt:
-                    # Transcribe audio to text
-                    transcribed_text = transcribe_audio(audio_file)
-                    if transcribed_text:
-                        prompt = transcribed_text
-                        messages.info(request, f"Transcribed audio: '{prompt[:100]}...'")
-                    else:
-                        messages.error(request, "Failed to transcribe audio. Please try again or enter text directly.")
-                        return render(request, 'tracker/ai_task_form.html', {
-                            'form': form,
-                            'categories': categories,
-                            'users': users
-                        })
-                
-                # Generate task details from prompt
-                if not prompt:
-                    messages.error(request, "Please provide either text or audio input")
-                    return render(request, 'tracker/ai_task_form.html', {
-                        'form': form,
-                        'categories': categories,
-                        'users': users
-                    })
-                
-                # Call Ollama to generate task details
-                task_data = generate_task_from_prompt(prompt)
-                
-                if not task_data:
-                    messages.error(request, "Failed to generate task from prompt. Please try again with a clearer description.")
-                    return render(request, 'tracker/ai_task_form.html', {
-                        'form': form,
-                        'categories': categories,
-                        'users': users
-                    })
+            audio_file = request.FILES.get('audio_file')
+            prompt = form.cleaned_data.get('prompt', '')
+            
+            if not prompt and not audio_file:
+                messages.error(request, "Please provide either text or audio input")
+            else:
+                # A due date only overrides the AI suggestion if the user set it and did not clear it
+                due_date = None
+                if 'due_date_cleared' not in request.POST and request.POST.get('due_date'):
+                    due_date = form.cleaned_data.get('due_date')
                 
-                # Create the task with generated data
-                with transaction.atomic():
-                    # Create a new task
-                    task = Task()
-                    
-                    # Use user-provided values if available, otherwise use AI suggestions
-                    task.title = form.cleaned_data.get('title') or task_data.get('title', 'Untitled Task')
-                    task.description = task_data.get('description', prompt)
-                    
-                    # Get category from AI suggestion
-                    category_id = task_data.get('category_id', 1)
-                    try:
-                        task.category = Category.objects.get(id=category_id)
-                    except Category.DoesNotExist:
-                        # Default to first category if suggested one doesn't exist
-                        task.category = Category.objects.first()
-                    
-                    # Use user-provided priority if available, otherwise use AI suggestion
-                    user_priority = form.cleaned_data.get('priority')
-                    if user_priority:
-                        task.priority = user_priority
-                    else:
-                        ai_priority = task_data.get('priority', 'Medium')
-                        # Ensure priority is valid
-                        from .models import PRIORITY_CHOICES
-                        if ai_priority not in dict(PRIORITY_CHOICES):
-                            ai_priority = 'Medium'
-                        task.priority = ai_priority
-                    
-                    # Check if user explicitly provided a due date or cleared it
-                    # If the form was submitted with an empty due_date field, form.cleaned_data['due_date'] will be None
-                    # If the user didn't touch the field, it will have the default value (tomorrow)
-                    user_due_date = form.cleaned_data.get('due_date')
-                    default_due_date = date.today() + timedelta(days=1)
-                    
-                    # Check if the user explicitly cleared the due date field using the clear button
-                    due_date_cleared = 'due_date_cleared' in request.POST
-                    
-                    # Check if the 'due_date' parameter was explicitly included in the POST data
-                    due_date_in_post = 'due_date' in request.POST and request.POST['due_date']
-                    
-                    if due_date_cleared:
-                        # User explicitly cleared the due date field, use AI suggestion
-                        ai_due_date = task_data.get('due_date')
-                        if ai_due_date:
-                            task.due_date = ai_due_date
-                            logger.info(f"Using AI-suggested due date (after user cleared field): {task.due_date}")
-                        else:
-                            # Default to 7 days from now if no AI suggestion
-                            task.due_date = date.today() + timedelta(days=7)
-                            logger.info(f"Using default due date (7 days) after user cleared field: {task.due_date}")
-                    elif due_date_in_post:
-                        # User explicitly set a due date
-                        task.due_date = user_due_date
-                        logger.info(f"Using user-provided due date: {task.due_date}")
-                    else:
-                        # Use AI-suggested date or default to 7 days from now
-                        ai_due_date = task_data.get('due_date')
-                        if ai_due_date:
-                            task.due_date = ai_due_date
-                            logger.info(f"Using AI-suggested due date: {task.due_date}")
-                        else:
-                            # Default to 7 days from now if no date is provided
-                            task.due_date = date.today() + timedelta(days=7)
-                            logger.info(f"Using default due date (7 days from now): {task.due_date}")
-                    
-                    logger.info(f"Setting task due date to: {task.due_date}")
-                    
-                    # Set default status
-                    task.status = 'Not Started'
-                    
-                    # Set creator and assigner
-                    task.created_by = request.user
-                    task.assigned_by = request.user
-                    
-                    # Save the task
-                    task.save()
-                    
-                    # Assign users
-                    assigned_to = form.cleaned_data.get('assigned_to')
-                    if assigned_to:
-                        task.assigned_to.set(assigned_to)
-                    else:
-                        # Default to assigning the creator
-                        task.assigned_to.add(request.user)
-                    
-                    logger.info(f"AI-generated task created: '{task.title}' by {request.user.username}")
-                    messages.success(request, "Task created successfully using AI")
-                    
-                    # Redirect to the task detail page
-                    return redirect('task_detail', task_id=task.id)
-                    
-            except Exception as e:
-                logger.error(f"Error creating AI task: {str(e)}")
-                messages.error(request, f"Error creating task: {str(e)}")
+                try:
+                    with transaction.atomic():
+                        job = AITaskJob.objects.create(
+                            created_by=request.user,
+                            prompt=prompt,
+                            # Stored in the row so a worker on another machine can read it
+                            audio_data=audio_file.read() if audio_file and not prompt else b'',
+                            audio_name=audio_file.name if audio_file and not prompt else '',
+                            title=form.cleaned_data.get('title') or '',
+                            priority=form.cleaned_data.get('priority') or '',
+                            due_date=due_date,
+                        )
+                        job.assigned_to.set(form.cleaned_data.get('assigned_to') or [])
+                    logger.info(f"AI task job {job.id} queued by {request.user.username}")
+                    return redirect('ai_task_job', job_id=job.id)
+                except Exception as e:
+                    logger.error(f"Error queueing AI task: {str(e)}")
+                    messages.error(request, f"Error creating task: {str(e)}")
         else:
             logger.warning(f"Invalid AI task form: {form.errors}")
     else:
@@ -628,6 +680,72 @@ def ai_task_create(request):
         'users': users
     })
 
+@login_required
+def ai_task_job(request, job_id):
+    """
+    Show the progress of an AI task job, or redirect to its task once created.
+    """
+    job = get_object_or_404(AITaskJob, id=job_id, created_by=request.user)
+    if job.status == 'done' and job.task_id:
+        messages.success(request, "Task created successfully using AI")
+        return redirect('task_detail', task_id=job.task_id)
+    return render(request, 'tracker/ai_task_job.html', {'job': job})
+
+@login_required
+@require_GET
+def ai_task_job_status(request, job_id):
+    """
+    Return the state of an AI task job as JSON for the status page to poll.
+    """
+    job = get_object_or_404(AITaskJob.objects.only('id', 'status', 'progress', 'error', 'task_id'), id=job_id, created_by=request.user)
+    return JsonResponse({
+        'status': job.status,
+        'progress': job.progress,
+        'error': job.error,
+        'task_url': reverse('task_detail', args=[job.task_id]) if job.task_id else None,
+    })
+
+def sse_event(event, data):
+    """Format one Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@login_required
+@require_GET
+def ai_task_preview_stream(request):
+    """
+    Stream the AI extraction of a prompt as Server-Sent Events.
+    
+    Sends ``progress`` events with the partial JSON generated so far and a
+    final ``result`` event with the extracted task details (or ``error``),
+    so the AI task form can show progress before the task is created.
+    
+    The stream runs in the request's worker, so Ollama only gets
+    ``AI_PREVIEW_TIMEOUT_SECONDS`` (not ``OLLAMA_TIMEOUT``) before the
+    preview falls back to rule-based extraction; creating the task itself
+    goes through the AI job worker without that limit.
+    """
+    prompt = request.GET.get('prompt', '').strip()
+
+    def events():
+        if not prompt:
+            yield sse_event('error', {'message': 'Please provide a task description'})
+            return
+        try:
+            for kind, value in stream_task_from_prompt(prompt, timeout=settings.AI_PREVIEW_TIMEOUT_SECONDS):
+                if kind == 'progress':
+                    yield sse_event('progress', {'text': value})
+                else:
+                    yield sse_event('result', value)
+        except Exception as e:
+            logger.error(f"Error streaming AI task preview: {str(e)}")
+            yield sse_event('error', {'message': 'Failed to generate task details'})
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 @login_required
 def task_gallery_view2(request):
     """
@@ -643,56 +761,20 @@ def task_gallery_view2(request):
     
     # Filter tasks by category and user permissions
     if selected_category_id:
-        base_query = Task.objects.filter(category_id=selected_category_id)
-        
-        # Apply role-based filtering
-        if not user.is_superuser:
-            try:
-                role = user.role.role_type
-                if role == 'Owner':
-                    # Owners see all tasks in the category
-                    tasks = base_query
-                elif role == 'Team Leader':
-                    # Team Leaders see tasks they've assigned
-                    tasks = base_query.filter(assigned_by=user)
-                else:
-                    # Team Members see tasks assigned to them
-                    tasks = base_query.filter(assigned_to=user)
-            except (Role.DoesNotExist, AttributeError):
-                # Default to assigned tasks if no role
-                tasks = base_query.filter(assigned_to=user)
-        else:
-            # Admins see all tasks
-            tasks = base_query
+        tasks = Task.objects.visible_to(user).filter(category_id=selected_category_id)
     else:
         tasks = []
     
-    # Prepare category data with pending task counts
-    category_data = []
-    for cat in categories:
-        # Count pending tasks (not approved) for this category
-        count_query = Task.objects.filter(category=cat).exclude(status='Approved')
-        
-        # Apply role-based filtering to counts as well
-        if not user.is_superuser:
-            try:
-                role = user.role.role_type
-                if role == 'Owner':
-                    count = count_query.count()
-                elif role == 'Team Leader':
-                    count = count_query.filter(assigned_by=user).count()
-                else:
-                    count = count_query.filter(assigned_to=user).count()
-            except (Role.DoesNotExist, AttributeError):
-                count = count_query.filter(assigned_to=user).count()
-        else:
-            count = count_query.count()
-            
-        category_data.append({
+    # Prepare category data with pending task counts from one grouped query
+    pending_counts = get_pending_counts_by_category(user)
+    category_data = [
+        {
             'id': cat.id,
             'name': cat.name,
-            'pending_count': count
-        })
+            'pending_count': pending_counts.get(cat.id, 0)
+        }
+        for cat in categories
+    ]
     
     context = {
         'categories': category_data,